@@ -114,6 +114,9 @@ class BaseAgent(ABC):
         self._message_handlers: Dict[str, Callable] = {}
         self._outbox_callback: Optional[Callable[[AgentMessage], None]] = None
         
+        # Signalé à la fin de chaque cycle (attente sans polling)
+        self.processed_event = asyncio.Event()
+        
         # Métriques
         self._metrics = {
             "messages_received": 0,
@@ -250,6 +253,8 @@ class BaseAgent(ABC):
             self._update_avg_cycle(cycle_duration)
             self._last_cycle_at = datetime.now()
             
+            self.processed_event.set()
+            
             # Attendre le prochain cycle
             sleep_time = max(0, cycle_time - cycle_duration / 1000)
             await asyncio.sleep(sleep_time)
@@ -14,6 +14,7 @@ from datetime import datetime
 from enum import Enum
 from typing import Any, Callable, Dict, List, Optional, Set, Tuple
 import asyncio
+import operator
 import structlog
 
 from robosafe.core.signal_manager import SignalManager, Signal
@@ -56,6 +57,17 @@ class ActionType(Enum):
     INCREASE_MARGIN = "increase_margin"  # Augmenter marges
 
 
+# Comparateurs acceptés par Rule.from_threshold
+_COMPARATORS: Dict[str, Callable[[Any, Any], bool]] = {
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+    "==": operator.eq,
+    "!=": operator.ne,
+}
+
+
 @dataclass
 class RuleAction:
     """Action à exécuter."""
@@ -97,6 +109,43 @@ class Rule:
     _last_triggered: Optional[datetime] = field(default=None, repr=False)
     _trigger_count: int = field(default=0, repr=False)
     
+    @classmethod
+    def from_threshold(
+        cls,
+        key: str,
+        op: str,
+        threshold: Any,
+        *,
+        default: Any = None,
+        **kwargs: Any,
+    ) -> "Rule":
+        """
+        Construit une règle à seuil simple sur un signal.
+        
+        La condition est une fermeture sur le comparateur et le seuil,
+        sans lambda intermédiaire ni recherche globale à l'évaluation.
+        
+        Args:
+            key: ID du signal comparé
+            op: Opérateur ("<", "<=", ">", ">=", "==", "!=")
+            threshold: Seuil de comparaison
+            default: Valeur utilisée si le signal est absent
+            **kwargs: Autres champs de Rule (id, name, priority, actions...)
+            
+        Returns:
+            Règle configurée
+        """
+        try:
+            compare = _COMPARATORS[op]
+        except KeyError:
+            raise ValueError(f"Opérateur de comparaison inconnu: {op!r}") from None
+        
+        def condition(ctx: Dict[str, Any]) -> bool:
+            return compare(ctx.get(key, default), threshold)
+        
+        kwargs.setdefault("required_signals", [key])
+        return cls(condition=condition, **kwargs)
+    
     def can_trigger(self) -> bool:
         """Vérifie si la règle peut être déclenchée (cooldown)."""
         if self.cooldown_ms <= 0 or self._last_triggered is None:
@@ -141,6 +190,8 @@ class RuleEngine:
         self._rules_by_priority: Dict[RulePriority, List[Rule]] = {
             p: [] for p in RulePriority
         }
+        # Ordre d'évaluation précalculé (P0 en premier), reconstruit à l'enregistrement
+        self._ordered_rules: Tuple[Rule, ...] = ()
         
         self._running = False
         self._eval_task: Optional[asyncio.Task] = None
@@ -167,6 +218,9 @@ class RuleEngine:
         """
         self._rules[rule.id] = rule
         self._rules_by_priority[rule.priority].append(rule)
+        self._ordered_rules = tuple(
+            r for p in RulePriority for r in self._rules_by_priority[p]
+        )
         
         logger.info(
             "rule_registered",
@@ -204,12 +258,17 @@ class RuleEngine:
             for signal_id, signal in signals.items()
         }
     
-    async def evaluate_rule(self, rule: Rule) -> RuleResult:
+    async def evaluate_rule(
+        self,
+        rule: Rule,
+        signal_values: Optional[Dict[str, Any]] = None,
+    ) -> RuleResult:
         """
         Évalue une règle unique.
         
         Args:
             rule: Règle à évaluer
+            signal_values: Valeurs des signaux (lues si None)
             
         Returns:
             Résultat d'évaluation
@@ -227,7 +286,8 @@ class RuleEngine:
                 return result
             
             # Récupérer les valeurs des signaux
-            signal_values = self.get_signal_values()
+            if signal_values is None:
+                signal_values = self.get_signal_values()
             result.condition_values = {
                 sig: signal_values.get(sig)
                 for sig in rule.required_signals
@@ -355,20 +415,10 @@ class RuleEngine:
         results = []
         self._eval_count += 1
         
-        # Évaluer par priorité (P0 en premier)
-        for priority in RulePriority:
-            for rule in self._rules_by_priority[priority]:
-                result = await self.evaluate_rule(rule)
-                results.append(result)
-                
-                # Si P0 ou P1 déclenché, on peut court-circuiter
-                if result.triggered and priority in (
-                    RulePriority.P0_CRITICAL,
-                    RulePriority.P1_HIGH,
-                ):
-                    # Les règles de haute priorité déclenchées
-                    # peuvent bloquer les évaluations suivantes
-                    pass
+        # Une lecture des signaux par cycle, règles déjà triées par priorité
+        signal_values = self.get_signal_values()
+        for rule in self._ordered_rules:
+            results.append(await self.evaluate_rule(rule, signal_values))
         
         # Historique
         self._results_history.extend(results)
@@ -214,6 +214,9 @@ class SignalManager:
         """
         Met à jour plusieurs signaux en batch.
         
+        Un seul horodatage et une seule prise du lock pour tout le lot;
+        les abonnés sont notifiés ensuite, hors du lock.
+        
         Args:
             updates: Dict {signal_id: value}
             quality: Qualité commune
@@ -221,14 +224,40 @@ class SignalManager:
         Returns:
             Nombre de signaux mis à jour
         """
-        count = 0
         timestamp = datetime.now()
+        definitions = self._definitions
+        
+        async with self._lock:
+            updated = {
+                signal_id: Signal(
+                    id=signal_id,
+                    name=definition.name,
+                    source=definition.source,
+                    value=value,
+                    timestamp=timestamp,
+                    quality=quality,
+                    unit=definition.unit,
+                    min_value=definition.min_value,
+                    max_value=definition.max_value,
+                    fail_safe_value=definition.fail_safe_value,
+                )
+                for signal_id, value in updates.items()
+                if (definition := definitions.get(signal_id)) is not None
+            }
+            self._signals.update(updated)
+            self._update_count += len(updated)
         
-        for signal_id, value in updates.items():
-            if await self.update_signal(signal_id, value, quality, timestamp):
-                count += 1
+        if len(updated) != len(updates):
+            logger.warning(
+                "unknown_signal_update",
+                signal_ids=[sid for sid in updates if sid not in updated],
+            )
+        
+        # Notifier (hors du lock)
+        for signal in updated.values():
+            await self._notify_subscribers(signal)
         
-        return count
+        return len(updated)
     
     def get_signal(self, signal_id: str) -> Optional[Signal]:
         """
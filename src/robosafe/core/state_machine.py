@@ -16,6 +16,7 @@ from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Optional, Callable, Dict, List
 import asyncio
+import time
 import structlog
 
 logger = structlog.get_logger(__name__)
@@ -79,11 +80,16 @@ class StateTransition:
     
     from_state: SafetyState
     to_state: SafetyState
-    timestamp: datetime = field(default_factory=datetime.now)
+    timestamp_ns: int = field(default_factory=time.time_ns)  # ns epoch
     trigger: str = ""
     rule_id: Optional[str] = None
     data: Dict = field(default_factory=dict)
     
+    @property
+    def timestamp(self) -> datetime:
+        """Horodatage (datetime construit à la lecture)."""
+        return datetime.fromtimestamp(self.timestamp_ns / 1e9)
+    
     def to_dict(self) -> Dict:
         """Convertit en dictionnaire pour logging."""
         return {
@@ -146,7 +152,7 @@ class SafetyStateMachine:
         self._on_transition = on_transition
         self._max_history = max_history
         self._history: List[StateTransition] = []
-        self._state_entered_at = datetime.now()
+        self._state_entered_ns = time.monotonic_ns()
         self._lock = asyncio.Lock()
         
         logger.info(
@@ -167,13 +173,23 @@ class SafetyStateMachine:
     @property
     def state_duration_seconds(self) -> float:
         """Durée dans l'état actuel en secondes."""
-        return (datetime.now() - self._state_entered_at).total_seconds()
+        return (time.monotonic_ns() - self._state_entered_ns) / 1e9
     
     @property
     def history(self) -> List[StateTransition]:
         """Historique des transitions (copie)."""
         return self._history.copy()
     
+    @classmethod
+    def _validate_transition(
+        cls, from_state: SafetyState, to_state: SafetyState
+    ) -> bool:
+        """Règle de transition pure (sans état ni verrou)."""
+        if from_state == to_state:
+            return True  # Pas de changement
+        
+        return to_state in cls.VALID_TRANSITIONS.get(from_state, ())
+    
     def can_transition_to(self, target_state: SafetyState) -> bool:
         """
         Vérifie si une transition vers l'état cible est valide.
@@ -184,11 +200,7 @@ class SafetyStateMachine:
         Returns:
             True si la transition est valide
         """
-        if self._current_state == target_state:
-            return True  # Pas de changement
-        
-        valid_targets = self.VALID_TRANSITIONS.get(self._current_state, [])
-        return target_state in valid_targets
+        return self._validate_transition(self._current_state, target_state)
     
     async def transition_to(
         self,
@@ -237,7 +249,7 @@ class SafetyStateMachine:
             
             self._previous_state = self._current_state
             self._current_state = target_state
-            self._state_entered_at = datetime.now()
+            self._state_entered_ns = time.monotonic_ns()
             
             # Historique
             self._history.append(transition)
@@ -321,6 +333,27 @@ class SafetyStateMachine:
             force=True,  # Fallback toujours accepté
         )
     
+    def reset(self, initial_state: SafetyState = SafetyState.INIT) -> None:
+        """
+        Réinitialise la machine (état, état précédent, historique).
+        
+        Contourne les règles de transition et n'appelle pas le callback:
+        réservé à la réinitialisation du système et aux tests, jamais pour
+        acquitter un E-STOP (passer par request_recovery).
+        
+        Args:
+            initial_state: État après réinitialisation
+        """
+        self._current_state = initial_state
+        self._previous_state = None
+        self._history.clear()
+        self._state_entered_ns = time.monotonic_ns()
+        
+        logger.warning(
+            "state_machine_reset",
+            initial_state=initial_state.name
+        )
+    
     def get_status(self) -> Dict:
         """Retourne le statut actuel."""
         return {
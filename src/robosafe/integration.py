@@ -259,11 +259,12 @@ class RoboSafeSentinel:
     def _setup_safety_rules(self) -> None:
         """Configure les règles de sécurité."""
         # RS-001: Distance critique
-        self.rule_engine.register_rule(Rule(
+        self.rule_engine.register_rule(Rule.from_threshold(
+            "scanner_min_distance", "<", 500,
+            default=10000,
             id="RS-001",
             name="Distance critique",
             priority=RulePriority.P0_CRITICAL,
-            condition=lambda ctx: ctx.get("scanner_min_distance", 10000) < 500,
             actions=[RuleAction(action_type="ESTOP", message="Distance < 500mm")],
         ))
         
@@ -286,11 +287,12 @@ class RoboSafeSentinel:
         ))
         
         # RS-004: Fumées critiques
-        self.rule_engine.register_rule(Rule(
+        self.rule_engine.register_rule(Rule.from_threshold(
+            "fumes_vlep_ratio", ">=", 1.2,
+            default=0,
             id="RS-004",
             name="Fumées critiques",
             priority=RulePriority.P0_CRITICAL,
-            condition=lambda ctx: ctx.get("fumes_vlep_ratio", 0) >= 1.2,
             actions=[RuleAction(action_type="STOP", message="Fumées > 120% VLEP")],
         ))
         
@@ -322,11 +324,12 @@ class RoboSafeSentinel:
         ))
         
         # RS-008: E-STOP physique
-        self.rule_engine.register_rule(Rule(
+        self.rule_engine.register_rule(Rule.from_threshold(
+            "estop_status", "==", 1,
+            default=0,
             id="RS-008",
             name="E-STOP physique",
             priority=RulePriority.P0_CRITICAL,
-            condition=lambda ctx: ctx.get("estop_status", 0) == 1,
             actions=[RuleAction(action_type="ESTOP", message="Bouton E-STOP activé")],
         ))
         
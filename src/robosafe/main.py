@@ -22,7 +22,7 @@ from robosafe import __version__
 from robosafe.core.state_machine import SafetyStateMachine, SafetyState
 from robosafe.core.signal_manager import SignalManager, get_welding_cell_signals
 from robosafe.core.rule_engine import RuleEngine, get_welding_cell_rules
-from robosafe.utils.config import load_config, RoboSafeConfig
+from robosafe.utils.config import load_config, RoboSafeConfig, RoboSafeConfigModel
 from robosafe.utils.logger import setup_logging
 
 console = Console()
@@ -42,7 +42,7 @@ class RoboSafeSentinel:
     
     def __init__(
         self,
-        config: Optional[RoboSafeConfig] = None,
+        config: Optional[RoboSafeConfigModel] = None,
         simulation_mode: bool = False,
     ):
         """
@@ -284,7 +284,7 @@ def main(
     # Charger configuration
     cfg = None
     if config:
-        cfg = load_config(config)
+        cfg = load_config(config, use_env=True)
         console.print(f"[green]Configuration chargée: {config}[/green]")
     
     # Créer l'application
@@ -449,7 +449,9 @@ class FumesSensorSimulator:
     
     def __init__(self, config: Optional[FumesConfig] = None):
         self.config = config or FumesConfig()
+        self._connected = False
         self._running = False
+        self._read_task: Optional[asyncio.Task] = None
         self._measurement = FumesMeasurement()
         self._callbacks_measurement: List[Callable] = []
         self._callbacks_alert: List[Callable] = []
@@ -462,26 +464,41 @@ class FumesSensorSimulator:
     
     @property
     def is_connected(self) -> bool:
-        return self._running
+        return self._connected
     
     @property
     def current_measurement(self) -> FumesMeasurement:
         return self._measurement
     
     async def connect(self) -> bool:
-        self._running = True
+        self._connected = True
         logger.info("fumes_simulator_connected")
         return True
     
     async def disconnect(self) -> None:
-        self._running = False
+        await self.stop_cyclic_read()
+        self._connected = False
         logger.info("fumes_simulator_disconnected")
     
     async def start_cyclic_read(self, interval_ms: float = 1000) -> None:
-        asyncio.create_task(self._simulation_loop(interval_ms / 1000.0))
+        if self._running:
+            return
+        
+        self._running = True
+        self._read_task = asyncio.create_task(
+            self._simulation_loop(interval_ms / 1000.0)
+        )
     
     async def stop_cyclic_read(self) -> None:
+        # Comme FumesSensorDriver: arrête la boucle sans déconnecter
         self._running = False
+        if self._read_task:
+            self._read_task.cancel()
+            try:
+                await self._read_task
+            except asyncio.CancelledError:
+                pass
+            self._read_task = None
     
     def set_welding_active(self, active: bool) -> None:
         """Simule l'activation/désactivation du soudage."""
@@ -14,6 +14,7 @@ Compatibilité:
 """
 
 import asyncio
+import math
 import struct
 from dataclasses import dataclass, field
 from datetime import datetime
@@ -69,7 +70,7 @@ class FanucConfig:
     speed_override_register: str = "R[1]"
 
 
-@dataclass 
+@dataclass
 class FanucTCPPosition:
     """Position TCP (Tool Center Point)."""
     x: float = 0.0      # mm
@@ -81,11 +82,9 @@ class FanucTCPPosition:
     
     def distance_to(self, other: 'FanucTCPPosition') -> float:
         """Calcule la distance euclidienne à une autre position."""
-        import math
-        return math.sqrt(
-            (self.x - other.x) ** 2 +
-            (self.y - other.y) ** 2 +
-            (self.z - other.z) ** 2
+        # hypot: noyau C sans dépassement intermédiaire des carrés
+        return math.hypot(
+            self.x - other.x, self.y - other.y, self.z - other.z
         )
 
 
@@ -10,6 +10,12 @@ Détection en temps réel via caméra industrielle:
 Requires:
     pip install opencv-python ultralytics numpy
 
+Optionnel (GPU NVIDIA):
+    pip install tensorrt  # Export/chargement moteur .engine FP16/INT8
+    pip install onnxruntime-gpu  # Repli ONNX Runtime (CUDA EP) sans TensorRT
+    OpenCV compilé avec CUDA + NVCUVID  # Décodage RTSP/fichier sur GPU
+    pip install numba  # Post-traitement des boxes compilé (JIT)
+
 Compatibilité:
     - Caméras GigE Vision (Basler, IDS, FLIR)
     - Caméras USB
@@ -17,10 +23,16 @@ Compatibilité:
 """
 
 import asyncio
+import copy
+import importlib.util
+import random
 import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import IntEnum, IntFlag
+from functools import lru_cache
+from pathlib import Path
 from typing import Any, Callable, Dict, List, Optional, Tuple
 import structlog
 
@@ -40,6 +52,30 @@ except ImportError:
     YOLO_AVAILABLE = False
     YOLO = None
 
+# torch (~1.7 s) et numba (~0.35 s) ne sont importés qu'au premier usage
+# (connexion du driver, premier post-traitement): l'import du package
+# capteurs (CLI, API) ne les paie pas
+TORCH_AVAILABLE = importlib.util.find_spec("torch") is not None
+torch = None
+
+try:
+    import onnxruntime as ort
+    ORT_AVAILABLE = True
+except ImportError:
+    ORT_AVAILABLE = False
+    ort = None
+
+NUMBA_AVAILABLE = importlib.util.find_spec("numba") is not None
+
+try:
+    CUDA_CODEC_AVAILABLE = (
+        CV2_AVAILABLE
+        and hasattr(cv2, "cudacodec")
+        and cv2.cuda.getCudaEnabledDeviceCount() > 0
+    )
+except Exception:
+    CUDA_CODEC_AVAILABLE = False
+
 logger = structlog.get_logger(__name__)
 
 
@@ -62,25 +98,45 @@ class PostureRisk(IntEnum):
     VERY_HIGH = 4    # Score 7+: Action immédiate
 
 
-@dataclass
+_INF = float('inf')
+
+
+@dataclass(slots=True)
 class VisionConfig:
     """Configuration du système de vision."""
     # Source vidéo
     camera_source: str = "0"  # Index, IP, ou chemin RTSP
     camera_type: str = "usb"  # usb, gige, rtsp
+    camera_backend: str = "cuda"  # cuda (RTSP/fichier décodé sur GPU), cpu
     
     # Résolution
     width: int = 1920
     height: int = 1080
     fps: int = 30
     
+    # Sous-échantillonnage après capture (0 = désactivé); la focale
+    # reste exprimée en pixels de la résolution native
+    preproc_width: int = 960
+    preproc_height: int = 540
+    
     # Modèles IA
     yolo_model: str = "yolov8n.pt"  # nano pour vitesse
+    imgsz: int = 640  # Entrée modèle carrée (letterbox), fixée à l'export
     ppe_model: Optional[str] = None  # Modèle custom EPI
+    runtime: str = "auto"  # auto (TensorRT > ONNX Runtime > PyTorch), tensorrt, onnx, torch
+    onnx_model: Optional[str] = None  # Chemin .onnx (exporté si absent)
+    torch_compile: bool = False  # torch.compile du modèle PyTorch (CUDA)
+    
+    # Accélération TensorRT
+    trt_engine: Optional[str] = None  # Chemin .engine (exporté si absent)
+    precision: str = "fp16"  # fp32, fp16, int8
+    int8_calib_dir: Optional[str] = None  # Dataset YAML calibration INT8
+    trt_nms: bool = True  # NMS intégrée au moteur (plugin EfficientNMS)
     
     # Seuils détection
     confidence_threshold: float = 0.5
     iou_threshold: float = 0.45
+    max_det: int = 50  # Détections max par frame
     
     # Calibration distance (à configurer selon installation)
     focal_length_px: float = 800.0    # Focale en pixels
@@ -92,9 +148,15 @@ class VisionConfig:
     
     # Timing
     process_interval_ms: int = 33  # ~30 FPS
+    
+    # Inférence par lot (1 = frame par frame)
+    batch_size: int = 1
+    
+    # Graine des scénarios VisionSimulator (None = non déterministe)
+    rng_seed: Optional[int] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class DetectedPerson:
     """Personne détectée."""
     id: int
@@ -118,7 +180,7 @@ class DetectedPerson:
         return self.bbox[3] - self.bbox[1]
 
 
-@dataclass
+@dataclass(slots=True)
 class VisionResult:
     """Résultat d'analyse vision."""
     timestamp: datetime = field(default_factory=datetime.now)
@@ -148,12 +210,41 @@ class VisionResult:
     ppe_alert: bool = False
     posture_alert: bool = False
     
+    # Vue SoA des personnes (même ordre que `persons`), remplie par le driver
+    distances_mm: Optional[np.ndarray] = None   # float64
+    confidences: Optional[np.ndarray] = None    # float32
+    ppe_missing: Optional[np.ndarray] = None    # uint8 (PPEType)
+    posture_risks: Optional[np.ndarray] = None  # uint8 (PostureRisk)
+    
+    def reset(self) -> "VisionResult":
+        """Remet le résultat à vide sur place (réutilisation par le pool du driver)."""
+        self.timestamp = datetime.now()
+        self.persons_detected = 0
+        self.persons.clear()
+        self.min_distance_mm = _INF
+        self.closest_person_id = None
+        self.all_ppe_ok = True
+        self.missing_ppe_types = PPEType.NONE
+        self.max_posture_risk = PostureRisk.LOW
+        self.frame_processed = True
+        self.processing_time_ms = 0.0
+        self.confidence_avg = 0.0
+        self.intrusion_detected = False
+        self.ppe_alert = False
+        self.posture_alert = False
+        self.distances_mm = None
+        self.confidences = None
+        self.ppe_missing = None
+        self.posture_risks = None
+        return self
+    
     def to_dict(self) -> Dict[str, Any]:
         """Convertit pour SignalManager."""
+        min_distance = self.min_distance_mm
         return {
             "vision_presence": self.persons_detected > 0,
             "vision_person_count": self.persons_detected,
-            "vision_min_distance": self.min_distance_mm if self.min_distance_mm != float('inf') else 10000,
+            "vision_min_distance": min_distance if min_distance != _INF else 10000,
             "vision_confidence": self.confidence_avg,
             "vision_ppe_ok": self.all_ppe_ok,
             "vision_ppe_missing": self.missing_ppe_types.value,
@@ -165,6 +256,155 @@ class VisionResult:
         }
 
 
+def _compute_missing_ppe(required: np.ndarray, detected: np.ndarray) -> np.ndarray:
+    """
+    EPI manquants par personne: required & ~detected sur tableaux uint8.
+    
+    Forme batch de PPEType (VisionResult.ppe_missing); required peut être
+    un scalaire diffusé sur toutes les personnes.
+    
+    Args:
+        required: EPI requis, uint8 (PPEType)
+        detected: EPI détectés, uint8 (N,) (PPEType)
+        
+    Returns:
+        EPI manquants uint8 (N,)
+    """
+    return np.bitwise_and(required, np.bitwise_not(detected), dtype=np.uint8)
+
+
+def _postprocess_boxes_numpy(
+    xyxy: np.ndarray,
+    focal_length_px: float,
+    known_height_mm: float,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Version NumPy de _postprocess_boxes (sans Numba)."""
+    width = xyxy[:, 2] - xyxy[:, 0]
+    height = xyxy[:, 3] - xyxy[:, 1]
+    safe_height = np.maximum(height, 1)
+    
+    distances = np.where(
+        height > 0,
+        (known_height_mm * focal_length_px) / safe_height,
+        np.inf,
+    )
+    ratios = np.where(height > 0, width / safe_height, 0.0)
+    risks = np.where(
+        ratios > 0.7,
+        PostureRisk.HIGH,
+        np.where(ratios > 0.5, PostureRisk.MEDIUM, PostureRisk.LOW),
+    ).astype(np.uint8)
+    
+    return distances, risks
+
+
+def _import_torch() -> Optional[Any]:
+    """
+    Importe torch au premier usage (chemins CUDA du driver).
+    
+    Returns:
+        Module torch, ou None s'il est absent ou ne s'importe pas
+    """
+    global torch
+    if torch is None and TORCH_AVAILABLE:
+        try:
+            import torch as _torch
+            torch = _torch
+        except ImportError:
+            pass
+    return torch
+
+
+def _postprocess_boxes_kernel(xyxy, focal_length_px, known_height_mm):
+    """Boucle de _postprocess_boxes, compilée par Numba (_get_postprocess_jit)."""
+    n = xyxy.shape[0]
+    distances = np.empty(n, dtype=np.float64)
+    risks = np.empty(n, dtype=np.uint8)
+    
+    for i in range(n):
+        width = xyxy[i, 2] - xyxy[i, 0]
+        height = xyxy[i, 3] - xyxy[i, 1]
+        
+        if height > 0:
+            distances[i] = (known_height_mm * focal_length_px) / height
+            ratio = width / height
+        else:
+            distances[i] = np.inf
+            ratio = 0.0
+        
+        if ratio > 0.7:
+            risks[i] = 3  # PostureRisk.HIGH
+        elif ratio > 0.5:
+            risks[i] = 2  # PostureRisk.MEDIUM
+        else:
+            risks[i] = 1  # PostureRisk.LOW
+    
+    return distances, risks
+
+
+@lru_cache(maxsize=1)
+def _get_postprocess_jit() -> Optional[Callable]:
+    """
+    Importe Numba et prépare le noyau au premier post-traitement.
+    
+    Returns:
+        Noyau compilé (au premier appel, cache disque), ou None si Numba
+        ne s'importe pas
+    """
+    if not NUMBA_AVAILABLE:
+        return None
+    try:
+        from numba import njit
+    except ImportError:
+        return None
+    # fastmath sans nnan/ninf: la distance vaut inf pour une hauteur nulle
+    return njit(cache=True, fastmath={"nsz", "arcp", "contract", "afn", "reassoc"})(
+        _postprocess_boxes_kernel
+    )
+
+
+def _postprocess_boxes(
+    xyxy: np.ndarray,
+    focal_length_px: float,
+    known_height_mm: float,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Calcule distance et risque posture pour toutes les boxes d'une frame.
+    
+    Distance: (hauteur_réelle × focale) / hauteur_pixels, inf si hauteur <= 0.
+    Posture (RULA simplifié, ratio largeur/hauteur): debout ~0.3-0.4,
+    penché/accroupi > 0.5. En production: MediaPipe ou modèle pose.
+    
+    Compilé avec Numba si disponible (une seule boucle, sans tableaux
+    intermédiaires), sinon vectorisé NumPy.
+    
+    Args:
+        xyxy: Boxes (N, 4) int32 en pixels frame
+        focal_length_px: Focale calibrée
+        known_height_mm: Hauteur humaine de référence
+        
+    Returns:
+        (distances_mm float64 (N,), risques posture uint8 (N,))
+    """
+    kernel = _get_postprocess_jit()
+    if kernel is not None:
+        return kernel(
+            np.ascontiguousarray(xyxy, dtype=np.int32),
+            float(focal_length_px),
+            float(known_height_mm),
+        )
+    return _postprocess_boxes_numpy(xyxy, focal_length_px, known_height_mm)
+
+
+class _OffloadedCallback:
+    """Callback synchrone exécuté dans l'executor (enregistré avec offload=True)."""
+    
+    __slots__ = ("callback",)
+    
+    def __init__(self, callback: Callable):
+        self.callback = callback
+
+
 class VisionAIDriver:
     """
     Driver de vision IA pour détection sécurité.
@@ -188,6 +428,27 @@ class VisionAIDriver:
     # Classes COCO pour personnes
     PERSON_CLASS_ID = 0
     
+    # Plage HSV jaune/orange (gilet haute visibilité)
+    YELLOW_HSV_LO = np.array([20, 100, 100], dtype=np.uint8)
+    YELLOW_HSV_HI = np.array([40, 255, 255], dtype=np.uint8)
+    
+    # Surface ROI minimale (pixels) pour une analyse couleur significative
+    PPE_MIN_ROI_AREA = 32 * 32
+    
+    # Frames bufferisées jetées au plus par capture (source live)
+    MAX_STALE_GRABS = 8
+    
+    # Pool de résultats réutilisés en anneau: un résultat remis aux
+    # callbacks / current_result reste valide pendant RESULT_POOL_SIZE - 1
+    # frames (le copier pour le conserver plus longtemps)
+    RESULT_POOL_SIZE = 4
+    MAX_POOLED_PERSONS = 32
+    
+    # Saut de frames adaptatif: EWMA du temps de traitement, surcharge
+    # au-delà de OVERLOAD_FACTOR × intervalle cible
+    EWMA_ALPHA = 0.1
+    OVERLOAD_FACTOR = 1.2
+    
     def __init__(self, config: Optional[VisionConfig] = None):
         """
         Initialise le driver vision.
@@ -200,12 +461,38 @@ class VisionAIDriver:
         
         self.config = config or VisionConfig()
         self._cap: Optional[cv2.VideoCapture] = None
+        self._gpu_reader: Optional[Any] = None  # cv2.cudacodec.VideoReader
+        self._live_source = False  # Caméra/flux: ne garder que la frame la plus récente
+        # Échelle frame traitée / frame native: déduite de la résolution
+        # configurée dès la construction (calibration possible avant la
+        # première frame), recalculée sur les frames réelles
+        self._frame_scale = self._preproc_scale(self.config.width, self.config.height)
+        
+        # Threads dédiés: I/O caméra et GPU (hors executor par défaut de la
+        # boucle, partagé avec DNS et autres I/O)
+        self._cam_exec: Optional[ThreadPoolExecutor] = None
+        self._gpu_exec: Optional[ThreadPoolExecutor] = None
         self._yolo_model: Optional[Any] = None
         self._ppe_model: Optional[Any] = None
+        
+        # Upload GPU des frames CPU (buffer hôte page-locked réutilisé)
+        self._cuda_upload = False  # Déterminé à la connexion (import torch)
+        self._pinned: Optional[Any] = None      # torch.Tensor (B, H, W, 3) uint8
+        self._gpu_buf: Optional[Any] = None     # Même forme, sur CUDA
+        self._upload_done: Optional[Any] = None  # torch.cuda.Event
         self._connected = False
         self._running = False
         self._process_task: Optional[asyncio.Task] = None
         
+        # Pool de résultats (anneau) et personnes réutilisées par résultat
+        self._result_pool = [VisionResult() for _ in range(self.RESULT_POOL_SIZE)]
+        self._person_pool: List[List[DetectedPerson]] = [[] for _ in range(self.RESULT_POOL_SIZE)]
+        self._pool_index = 0
+        
+        # Temps de traitement lissé (EWMA, ms) et état de surcharge
+        self._ewma_ms = 0.0
+        self._overloaded = False
+        
         # Tracking
         self._person_id_counter = 0
         self._tracked_persons: Dict[int, DetectedPerson] = {}
@@ -227,7 +514,7 @@ class VisionAIDriver:
     
     @property
     def is_connected(self) -> bool:
-        return self._connected and self._cap is not None
+        return self._connected and (self._cap is not None or self._gpu_reader is not None)
     
     @property
     def current_result(self) -> VisionResult:
@@ -242,6 +529,17 @@ class VisionAIDriver:
         """
         try:
             loop = asyncio.get_event_loop()
+            self._start_executors()
+            
+            # Import torch hors de la boucle d'événements
+            self._cuda_upload = await loop.run_in_executor(
+                self._gpu_exec, self._cuda_available
+            )
+            
+            source = self.config.camera_source
+            self._live_source = source.isdigit() or source.startswith(
+                ("rtsp://", "http://", "https://")
+            )
             
             # Ouvrir la caméra
             def _open_camera():
@@ -260,32 +558,60 @@ class VisionAIDriver:
                     cap.set(cv2.CAP_PROP_FRAME_WIDTH, self.config.width)
                     cap.set(cv2.CAP_PROP_FRAME_HEIGHT, self.config.height)
                     cap.set(cv2.CAP_PROP_FPS, self.config.fps)
+                    # Buffer driver minimal (ignoré par certains backends)
+                    cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
                     return cap
                 return None
             
-            self._cap = await loop.run_in_executor(None, _open_camera)
+            self._gpu_reader = await loop.run_in_executor(self._cam_exec, self._open_gpu_reader)
             
-            if self._cap is None:
-                logger.error("vision_camera_open_failed", source=self.config.camera_source)
-                return False
+            if self._gpu_reader is None:
+                self._cap = await loop.run_in_executor(self._cam_exec, _open_camera)
+                
+                if self._cap is None:
+                    logger.error("vision_camera_open_failed", source=self.config.camera_source)
+                    return False
             
             # Charger modèle YOLO
             if YOLO_AVAILABLE:
-                def _load_yolo():
-                    return YOLO(self.config.yolo_model)
-                
-                self._yolo_model = await loop.run_in_executor(None, _load_yolo)
-                logger.info("yolo_model_loaded", model=self.config.yolo_model)
+                self._yolo_model = await loop.run_in_executor(self._gpu_exec, self._load_yolo)
+                logger.info(
+                    "yolo_model_loaded",
+                    model=self.config.yolo_model,
+                    runtime=self.config.runtime,
+                    engine=self.config.trt_engine,
+                    onnx=self.config.onnx_model,
+                    precision=self.config.precision,
+                )
             else:
                 logger.warning("yolo_not_available", using="fallback_detection")
             
+            # Compilation JIT payée ici plutôt qu'à la première détection
+            if NUMBA_AVAILABLE:
+                await loop.run_in_executor(
+                    self._gpu_exec,
+                    _postprocess_boxes,
+                    np.zeros((1, 4), dtype=np.int32),
+                    self.config.focal_length_px,
+                    self.config.known_height_mm,
+                )
+            
             self._connected = True
-            logger.info(
-                "vision_connected",
-                width=int(self._cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
-                height=int(self._cap.get(cv2.CAP_PROP_FRAME_HEIGHT)),
-                fps=int(self._cap.get(cv2.CAP_PROP_FPS)),
-            )
+            if self._gpu_reader is not None:
+                fmt = self._gpu_reader.format()
+                logger.info(
+                    "vision_connected",
+                    width=fmt.width,
+                    height=fmt.height,
+                    backend="cuda",
+                )
+            else:
+                logger.info(
+                    "vision_connected",
+                    width=int(self._cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+                    height=int(self._cap.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+                    fps=int(self._cap.get(cv2.CAP_PROP_FPS)),
+                )
             
             return True
             
@@ -294,15 +620,233 @@ class VisionAIDriver:
             self._connected = False
             return False
     
+    def _open_gpu_reader(self) -> Optional[Any]:
+        """
+        Ouvre un décodeur vidéo GPU (cv2.cudacodec) pour les flux RTSP/fichiers.
+        
+        Les frames décodées restent en mémoire GPU (GpuMat), ce qui évite une
+        copie hôte -> GPU par frame avant l'inférence.
+        
+        Returns:
+            VideoReader CUDA, ou None si non applicable (caméra USB/GigE,
+            backend cpu, OpenCV sans CUDA) ou si l'ouverture échoue
+        """
+        source = self.config.camera_source
+        
+        if (
+            self.config.camera_backend != "cuda"
+            or not CUDA_CODEC_AVAILABLE
+            or _import_torch() is None
+            or source.isdigit()
+        ):
+            return None
+        
+        try:
+            reader = cv2.cudacodec.createVideoReader(source)
+            reader.set(cv2.cudacodec.ColorFormat_BGR)
+            return reader
+        except Exception as e:
+            logger.warning("vision_cuda_reader_failed", error=str(e), using="cpu")
+            return None
+    
+    @staticmethod
+    def _cuda_available() -> bool:
+        """Upload GPU possible: torch importable et CUDA disponible."""
+        torch_module = _import_torch()
+        return torch_module is not None and torch_module.cuda.is_available()
+    
+    def _input_size(self) -> int:
+        """Côté de l'entrée modèle carrée, aligné sur le stride YOLO (32)."""
+        return -(-self.config.imgsz // 32) * 32
+    
+    def _letterbox_geometry(self, fw: int, fh: int) -> Tuple[float, int, int, int, int]:
+        """
+        Géométrie letterbox d'une frame fw x fh vers l'entrée modèle carrée.
+        
+        Returns:
+            (échelle, largeur redimensionnée, hauteur redimensionnée,
+            marge gauche, marge haute)
+        """
+        size = self._input_size()
+        scale = min(size / fw, size / fh)
+        nw, nh = round(fw * scale), round(fh * scale)
+        return scale, nw, nh, (size - nw) // 2, (size - nh) // 2
+    
+    def _load_yolo(self) -> Any:
+        """
+        Charge le modèle YOLO selon `runtime`.
+        
+        En mode auto: moteur TensorRT, sinon ONNX Runtime (CUDA EP si
+        disponible), sinon PyTorch. Les trois passent par Ultralytics, donc
+        les résultats gardent le même format (results[0].boxes).
+        
+        Returns:
+            Modèle YOLO prêt pour l'inférence
+        """
+        runtime = self.config.runtime
+        
+        if runtime in ("auto", "tensorrt"):
+            model = self._load_tensorrt()
+            if model is not None:
+                return model
+        
+        if runtime in ("auto", "onnx"):
+            if ORT_AVAILABLE:
+                model = self._load_onnx()
+                if model is not None:
+                    return model
+            elif runtime == "onnx":
+                logger.warning("onnxruntime_not_available", using="pytorch")
+        
+        model = YOLO(self.config.yolo_model)
+        if self._cuda_upload:
+            self._optimize_torch(model)
+        return model
+    
+    def _optimize_torch(self, model: Any) -> None:
+        """
+        Optimise le modèle PyTorch sur GPU (sans TensorRT).
+        
+        Une inférence à vide crée le predictor Ultralytics (modèle fusionné,
+        FP16); le réseau est ensuite passé en channels_last (noyaux NHWC
+        cuDNN) et, si `torch_compile`, compilé en mode reduce-overhead.
+        Une seconde inférence à vide paie la compilation au connect.
+        
+        Args:
+            model: Modèle YOLO PyTorch
+        """
+        size = self._input_size()
+        dummy = torch.zeros((self.config.batch_size, 3, size, size), device="cuda")
+        
+        backend = net = None
+        
+        try:
+            model.predict(dummy, imgsz=size, half=True, verbose=False)
+            backend = model.predictor.model
+            net = backend.model
+            
+            optimized = net.to(memory_format=torch.channels_last)
+            if self.config.torch_compile:
+                optimized = torch.compile(optimized, mode="reduce-overhead", fullgraph=False)
+            
+            backend.model = optimized
+            model.predict(dummy, imgsz=size, half=True, verbose=False)
+            logger.info("torch_model_optimized", compiled=self.config.torch_compile)
+        except Exception as e:
+            if backend is not None:
+                backend.model = net
+            logger.warning("torch_optimization_failed", error=str(e))
+    
+    def _load_tensorrt(self) -> Optional[Any]:
+        """
+        Charge le moteur TensorRT, en l'exportant si nécessaire.
+        
+        Si `trt_engine` existe, il est chargé directement. Sinon le modèle
+        PyTorch est exporté une seule fois en .engine (FP16 ou INT8) et le
+        chemin est mémorisé dans la config. None si l'export échoue (pas de
+        GPU / TensorRT absent) ou si precision == "fp32".
+        
+        Avec `trt_nms`, la NMS est intégrée au moteur (EfficientNMS, noyau
+        CUDA) avec les seuils conf/iou de la config; Ultralytics détecte un
+        modèle end-to-end et saute alors sa NMS CPU.
+        
+        Returns:
+            Modèle YOLO TensorRT, ou None
+        """
+        cfg = self.config
+        
+        if cfg.trt_engine and Path(cfg.trt_engine).exists():
+            return YOLO(cfg.trt_engine, task="detect")
+        
+        if cfg.precision in ("fp16", "int8"):
+            try:
+                engine_path = YOLO(cfg.yolo_model).export(
+                    format="engine",
+                    imgsz=self._input_size(),
+                    half=cfg.precision == "fp16",
+                    int8=cfg.precision == "int8",
+                    data=cfg.int8_calib_dir,
+                    dynamic=cfg.batch_size > 1,
+                    batch=cfg.batch_size,
+                    nms=cfg.trt_nms,
+                    agnostic_nms=False,
+                    max_det=cfg.max_det,
+                    iou=cfg.iou_threshold,
+                    conf=cfg.confidence_threshold,
+                    workspace=4,
+                    verbose=False,
+                )
+                cfg.trt_engine = str(engine_path)
+                logger.info(
+                    "tensorrt_engine_exported",
+                    engine=cfg.trt_engine,
+                    nms=cfg.trt_nms,
+                )
+                return YOLO(cfg.trt_engine, task="detect")
+            except Exception as e:
+                logger.warning("tensorrt_export_failed", error=str(e))
+        
+        return None
+    
+    def _load_onnx(self) -> Optional[Any]:
+        """
+        Charge le modèle ONNX (ONNX Runtime), en l'exportant si nécessaire.
+        
+        Ultralytics choisit le CUDAExecutionProvider quand onnxruntime-gpu
+        et CUDA sont disponibles, sinon le CPU. Plus léger que PyTorch pour
+        les déploiements edge sans SDK TensorRT.
+        
+        Returns:
+            Modèle YOLO ONNX, ou None si l'export échoue
+        """
+        cfg = self.config
+        
+        if cfg.onnx_model and Path(cfg.onnx_model).exists():
+            return YOLO(cfg.onnx_model, task="detect")
+        
+        try:
+            onnx_path = YOLO(cfg.yolo_model).export(
+                format="onnx",
+                imgsz=self._input_size(),
+                dynamic=cfg.batch_size > 1,
+                batch=cfg.batch_size,
+                simplify=True,
+                verbose=False,
+            )
+            cfg.onnx_model = str(onnx_path)
+            logger.info(
+                "onnx_model_exported",
+                model=cfg.onnx_model,
+                providers=ort.get_available_providers(),
+            )
+            return YOLO(cfg.onnx_model, task="detect")
+        except Exception as e:
+            logger.warning("onnx_export_failed", error=str(e))
+        
+        return None
+    
     async def disconnect(self) -> None:
         """Ferme la connexion caméra."""
         if self._cap:
             self._cap.release()
             self._cap = None
+        self._gpu_reader = None
+        
+        for executor in (self._cam_exec, self._gpu_exec):
+            if executor is not None:
+                executor.shutdown(wait=False, cancel_futures=True)
+        self._cam_exec = self._gpu_exec = None
         
         self._connected = False
         logger.info("vision_disconnected")
     
+    def _start_executors(self) -> None:
+        """Crée les executors caméra et GPU (un thread chacun)."""
+        if self._cam_exec is None:
+            self._cam_exec = ThreadPoolExecutor(max_workers=1, thread_name_prefix="vision-cam")
+        if self._gpu_exec is None:
+            self._gpu_exec = ThreadPoolExecutor(max_workers=1, thread_name_prefix="vision-gpu")
+    
     async def process_frame(self) -> Optional[VisionResult]:
         """
         Capture et analyse une frame.
@@ -313,17 +857,13 @@ class VisionAIDriver:
         if not self.is_connected:
             return None
         
-        start_time = time.time()
+        start_ns = time.monotonic_ns()
         
         try:
             loop = asyncio.get_event_loop()
             
             # Capture frame
-            def _capture():
-                ret, frame = self._cap.read()
-                return frame if ret else None
-            
-            frame = await loop.run_in_executor(None, _capture)
+            frame = await loop.run_in_executor(self._cam_exec, self._capture)
             
             if frame is None:
                 return None
@@ -331,40 +871,9 @@ class VisionAIDriver:
             self._frame_count += 1
             
             # Détection YOLO
-            persons = await self._detect_persons(frame)
-            
-            # Créer résultat
-            result = VisionResult(
-                timestamp=datetime.now(),
-                persons_detected=len(persons),
-                persons=persons,
-            )
-            
-            # Calculer métriques
-            if persons:
-                distances = [p.distance_mm for p in persons]
-                result.min_distance_mm = min(distances)
-                result.closest_person_id = min(persons, key=lambda p: p.distance_mm).id
-                result.confidence_avg = sum(p.confidence for p in persons) / len(persons)
-                
-                # Vérifier EPI
-                missing_ppe = PPEType.NONE
-                for person in persons:
-                    missing_ppe |= person.ppe_missing
-                
-                result.missing_ppe_types = missing_ppe
-                result.all_ppe_ok = missing_ppe == PPEType.NONE
-                result.ppe_alert = not result.all_ppe_ok
-                
-                # Posture max
-                result.max_posture_risk = max(p.posture_risk for p in persons)
-                result.posture_alert = result.max_posture_risk >= PostureRisk.HIGH
-                
-                # Intrusion (distance critique)
-                result.intrusion_detected = result.min_distance_mm < 800
-            
-            result.processing_time_ms = (time.time() - start_time) * 1000
+            result = await self._detect_persons(frame)
             
+            self._finalize_result(result, start_ns)
             self._current_result = result
             
             # Notifier
@@ -376,96 +885,419 @@ class VisionAIDriver:
             logger.warning("vision_process_error", error=str(e))
             return None
     
-    async def _detect_persons(self, frame: np.ndarray) -> List[DetectedPerson]:
+    def _capture(self) -> Optional[Any]:
         """
-        Détecte les personnes dans la frame.
+        Lit une frame caméra (bloquant, exécuté dans un thread).
+        
+        Returns:
+            Frame BGR (np.ndarray, ou cv2.cuda_GpuMat avec le décodeur GPU)
+        """
+        if self._gpu_reader is not None:
+            ret, gpu_frame = self._gpu_reader.nextFrame()
+            return self._downsample(gpu_frame) if ret else None
+        
+        if self._live_source:
+            # Ne décoder que la frame la plus récente: les frames déjà en
+            # buffer sont seulement grab()ées puis jetées
+            if not self._grab_latest():
+                return None
+            ret, frame = self._cap.retrieve()
+        else:
+            ret, frame = self._cap.read()
+        return self._downsample(frame) if ret else None
+    
+    def _grab_latest(self) -> bool:
+        """
+        Vide le buffer caméra jusqu'à la frame la plus récente.
+        
+        Un grab() qui revient en moins d'une demi-période image lisait une
+        frame déjà en buffer (en retard); on continue jusqu'à un grab qui a
+        attendu une nouvelle frame, dans la limite de MAX_STALE_GRABS.
+        
+        Returns:
+            True si une frame est prête pour retrieve()
+        """
+        half_period_ns = 500_000_000 // max(self.config.fps, 1)
+        
+        for _ in range(self.MAX_STALE_GRABS):
+            t0 = time.monotonic_ns()
+            if not self._cap.grab():
+                return False
+            if time.monotonic_ns() - t0 >= half_period_ns:
+                break
+        
+        return True
+    
+    def _preproc_scale(self, fw: int, fh: int) -> float:
+        """Échelle de sous-échantillonnage d'une frame fw x fh (1.0 si aucun)."""
+        pw, ph = self.config.preproc_width, self.config.preproc_height
+        if not pw or not ph or (fw <= pw and fh <= ph):
+            return 1.0
+        return min(pw / fw, ph / fh)
+    
+    def _downsample(self, frame: Any) -> Any:
+        """
+        Réduit la frame à preproc_width x preproc_height (ratio conservé).
+        
+        YOLO redimensionne de toute façon à imgsz: réduire une seule fois ici
+        (INTER_AREA, sur GPU pour une GpuMat) divise les octets lus par le
+        letterbox, l'upload GPU et l'analyse EPI. Met à jour `_frame_scale`
+        pour l'estimation de distance.
+        
+        Args:
+            frame: Frame BGR native (np.ndarray ou GpuMat)
+            
+        Returns:
+            Frame réduite, ou la frame d'origine si déjà assez petite
+        """
+        if self._is_gpu_frame(frame):
+            fw, fh = frame.size()
+        else:
+            fh, fw = frame.shape[:2]
+        
+        scale = self._frame_scale = self._preproc_scale(fw, fh)
+        if scale == 1.0:
+            return frame
+        
+        size = (round(fw * scale), round(fh * scale))
+        
+        if self._is_gpu_frame(frame):
+            return cv2.cuda.resize(frame, size, interpolation=cv2.INTER_AREA)
+        return cv2.resize(frame, size, interpolation=cv2.INTER_AREA)
+    
+    @staticmethod
+    def _is_gpu_frame(frame: Any) -> bool:
+        """Indique si la frame est en mémoire GPU (GpuMat)."""
+        return CUDA_CODEC_AVAILABLE and isinstance(frame, cv2.cuda_GpuMat)
+    
+    def _model_input(self, frames: List[Any]) -> Any:
+        """
+        Prépare l'entrée YOLO pour une ou plusieurs frames.
+        
+        Les GpuMat sont redimensionnées/converties sur GPU et empilées en un
+        tenseur CUDA BCHW. Les frames CPU sont transférées via un buffer
+        page-locked si CUDA est disponible, sinon passées telles quelles
+        (letterbox CPU d'Ultralytics).
+        
+        Args:
+            frames: Frames capturées
+            
+        Returns:
+            Source à passer au modèle
+        """
+        if self._is_gpu_frame(frames[0]):
+            return torch.cat([self._gpu_preprocess(f) for f in frames])
+        
+        if self._cuda_upload:
+            return self._upload_frames(frames)
+        
+        return frames[0] if len(frames) == 1 else frames
+    
+    def _upload_frames(self, frames: List[np.ndarray]) -> Any:
+        """
+        Transfère des frames BGR vers le GPU via un buffer page-locked réutilisé.
+        
+        La copie hôte -> GPU est asynchrone (non_blocking) et se recouvre avec
+        le calcul en cours sur le stream; conversion RGB et letterbox se
+        font ensuite sur GPU.
+        
+        Args:
+            frames: Frames BGR de même taille
+            
+        Returns:
+            Tenseur (N, 3, h, w) float32 dans [0, 1]
+        """
+        n = len(frames)
+        shape = (max(n, self.config.batch_size),) + frames[0].shape
+        
+        if self._pinned is None or tuple(self._pinned.shape) != shape:
+            self._pinned = torch.empty(shape, dtype=torch.uint8, pin_memory=True)
+            self._gpu_buf = torch.empty_like(self._pinned, device="cuda")
+            self._upload_done = torch.cuda.Event()
+        
+        # Le buffer hôte ne doit pas être réécrit avant la fin de la copie précédente
+        self._upload_done.synchronize()
+        
+        pinned = self._pinned[:n]
+        for i, frame in enumerate(frames):
+            np.copyto(pinned[i].numpy(), frame)
+        
+        gpu = self._gpu_buf[:n]
+        gpu.copy_(pinned, non_blocking=True)
+        self._upload_done.record()
+        
+        fh, fw = frames[0].shape[:2]
+        _, nw, nh, left, top = self._letterbox_geometry(fw, fh)
+        size = self._input_size()
+        
+        x = gpu.permute(0, 3, 1, 2).flip(1).float().div_(255)
+        x = torch.nn.functional.interpolate(
+            x, size=(nh, nw), mode="bilinear", align_corners=False
+        )
+        return torch.nn.functional.pad(
+            x, (left, size - nw - left, top, size - nh - top), value=114 / 255
+        )
+    
+    def _gpu_preprocess(self, gpu_frame: Any) -> Any:
+        """
+        Letterbox et conversion d'une GpuMat BGR en tenseur CUDA RGB normalisé.
+        
+        Redimensionnement (cv2.cuda.resize), bordures et conversion couleur
+        restent sur GPU; le tenseur partage la mémoire de la GpuMat via
+        __cuda_array_interface__ jusqu'à la conversion float.
+        
+        Args:
+            gpu_frame: Frame BGR en mémoire GPU
+            
+        Returns:
+            Tenseur (1, 3, imgsz, imgsz) float32 dans [0, 1]
+        """
+        fw, fh = gpu_frame.size()
+        _, nw, nh, left, top = self._letterbox_geometry(fw, fh)
+        size = self._input_size()
+        
+        resized = cv2.cuda.resize(gpu_frame, (nw, nh), interpolation=cv2.INTER_LINEAR)
+        padded = cv2.cuda.copyMakeBorder(
+            resized,
+            top, size - nh - top, left, size - nw - left,
+            cv2.BORDER_CONSTANT,
+            value=(114, 114, 114),
+        )
+        rgb = cv2.cuda.cvtColor(padded, cv2.COLOR_BGR2RGB)
+        tensor = torch.as_tensor(rgb, device="cuda")
+        return tensor.permute(2, 0, 1).unsqueeze(0).float().div_(255)
+    
+    def _frame_roi(self, frame: Any, x1: int, y1: int, x2: int, y2: int) -> np.ndarray:
+        """
+        Extrait une ROI BGR sur l'hôte.
+        
+        Pour une GpuMat, seule la ROI est téléchargée.
+        """
+        if not self._is_gpu_frame(frame):
+            return frame[y1:y2, x1:x2]
+        
+        fw, fh = frame.size()
+        x1, x2 = max(0, min(x1, fw)), max(0, min(x2, fw))
+        y1, y2 = max(0, min(y1, fh)), max(0, min(y2, fh))
+        if x2 <= x1 or y2 <= y1:
+            return np.empty((0, 0, 3), dtype=np.uint8)
+        return cv2.cuda_GpuMat(frame, (x1, y1, x2 - x1, y2 - y1)).download()
+    
+    def _box_transform(self, frame: Any) -> Optional[Tuple[float, int, int]]:
+        """
+        Transformation des boxes modèle vers les pixels de la frame.
+        
+        Les boxes sont en coordonnées letterbox quand la frame a été
+        convertie ici en tenseur CUDA (GpuMat ou upload page-locked);
+        Ultralytics les remet déjà à l'échelle pour les frames NumPy.
+        
+        Returns:
+            (échelle, marge gauche, marge haute), ou None si identité
+        """
+        if self._is_gpu_frame(frame):
+            fw, fh = frame.size()
+        elif self._cuda_upload:
+            fh, fw = frame.shape[:2]
+        else:
+            return None
+        
+        scale, _, _, left, top = self._letterbox_geometry(fw, fh)
+        return scale, left, top
+    
+    def _infer(self, frames: List[Any]) -> Any:
+        """
+        Prétraitement GPU puis inférence d'un lot (thread vision-gpu).
         
         Args:
-            frame: Image BGR
+            frames: Frames capturées
             
         Returns:
-            Liste des personnes détectées
+            Résultats Ultralytics, un par frame
+        """
+        return self._run_yolo(self._model_input(frames))
+    
+    def _run_yolo(self, source: Any) -> Any:
+        """
+        Exécute YOLO (bloquant, exécuté dans un thread).
+        
+        Args:
+            source: Frame BGR ou liste de frames (inférence par lot)
+            
+        Returns:
+            Résultats Ultralytics, un par frame
+        """
+        return self._yolo_model(
+            source,
+            imgsz=self._input_size(),
+            conf=self.config.confidence_threshold,
+            iou=self.config.iou_threshold,
+            max_det=self.config.max_det,
+            classes=[self.PERSON_CLASS_ID],  # Personnes uniquement
+            verbose=False,
+        )
+    
+    def _finalize_result(self, result: VisionResult, start_ns: int) -> VisionResult:
         """
-        persons = []
+        Calcule les agrégats et alertes d'une frame à partir de la vue SoA.
+        
+        Args:
+            result: Résultat avec personnes et tableaux SoA remplis
+            start_ns: Début de traitement de la frame (time.monotonic_ns())
+            
+        Returns:
+            Le même résultat, complété
+        """
+        # Horodatage: l'unique datetime.now() de la frame est celui pris à la
+        # création du résultat; le chronométrage utilise l'horloge monotone
+        # Calculer métriques
+        if result.persons_detected:
+            closest = int(result.distances_mm.argmin())
+            result.min_distance_mm = float(result.distances_mm[closest])
+            result.closest_person_id = result.persons[closest].id
+            result.confidence_avg = float(result.confidences.mean())
+            
+            # Vérifier EPI
+            missing_ppe = PPEType(int(np.bitwise_or.reduce(result.ppe_missing)))
+            result.missing_ppe_types = missing_ppe
+            result.all_ppe_ok = missing_ppe == PPEType.NONE
+            result.ppe_alert = not result.all_ppe_ok
+            
+            # Posture max
+            result.max_posture_risk = PostureRisk(int(result.posture_risks.max()))
+            result.posture_alert = result.max_posture_risk >= PostureRisk.HIGH
+            
+            # Intrusion (distance critique)
+            result.intrusion_detected = result.min_distance_mm < 800
+        
+        result.processing_time_ms = (time.monotonic_ns() - start_ns) / 1e6
+        self._ewma_ms += self.EWMA_ALPHA * (result.processing_time_ms - self._ewma_ms)
+        return result
+    
+    async def _detect_persons(self, frame: Any) -> VisionResult:
+        """
+        Détecte les personnes dans la frame.
         
+        Args:
+            frame: Image BGR (np.ndarray ou GpuMat)
+            
+        Returns:
+            Résultat avec personnes et vue SoA (agrégats non calculés)
+        """
         if self._yolo_model is None:
-            return persons
+            return self._next_result()[0]
         
         try:
             loop = asyncio.get_event_loop()
-            
-            def _run_yolo():
-                results = self._yolo_model(
-                    frame,
-                    conf=self.config.confidence_threshold,
-                    iou=self.config.iou_threshold,
-                    classes=[self.PERSON_CLASS_ID],  # Personnes uniquement
-                    verbose=False,
-                )
-                return results
-            
-            results = await loop.run_in_executor(None, _run_yolo)
+            results = await loop.run_in_executor(self._gpu_exec, self._infer, [frame])
             
             if results and len(results) > 0:
-                boxes = results[0].boxes
-                
-                for i, box in enumerate(boxes):
-                    # Bounding box
-                    x1, y1, x2, y2 = map(int, box.xyxy[0].tolist())
-                    confidence = float(box.conf[0])
-                    
-                    # Estimer distance
-                    height_px = y2 - y1
-                    distance_mm = self._estimate_distance(height_px)
-                    
-                    # Vérifier EPI (simplifié - à améliorer avec modèle custom)
-                    ppe_detected, ppe_missing = await self._check_ppe(
-                        frame[y1:y2, x1:x2]
-                    )
-                    
-                    # Analyser posture (simplifié)
-                    posture_risk = self._analyze_posture(box)
-                    
-                    # Vérifier zone danger
-                    in_danger = distance_mm < 500
-                    
-                    self._person_id_counter += 1
-                    
-                    person = DetectedPerson(
-                        id=self._person_id_counter,
-                        bbox=(x1, y1, x2, y2),
-                        confidence=confidence,
-                        distance_mm=distance_mm,
-                        ppe_detected=ppe_detected,
-                        ppe_missing=ppe_missing,
-                        posture_risk=posture_risk,
-                        in_danger_zone=in_danger,
-                    )
-                    
-                    persons.append(person)
+                return await self._analyze_detections(frame, results[0])
             
         except Exception as e:
             logger.warning("yolo_detection_error", error=str(e))
         
-        return persons
+        return self._next_result()[0]
+    
+    def _next_result(self) -> Tuple[VisionResult, List[DetectedPerson]]:
+        """
+        Prend le résultat suivant du pool, remis à vide.
+        
+        Returns:
+            (résultat, personnes réutilisables de ce résultat)
+        """
+        slot = self._pool_index
+        self._pool_index = (slot + 1) % self.RESULT_POOL_SIZE
+        return self._result_pool[slot].reset(), self._person_pool[slot]
     
-    def _estimate_distance(self, height_px: int) -> float:
+    def _pooled_person(self, pooled: List[DetectedPerson], index: int) -> DetectedPerson:
         """
-        Estime la distance basée sur la hauteur apparente.
+        Personne réutilisable n° index d'un résultat du pool.
         
-        Formule: distance = (hauteur_réelle × focale) / hauteur_pixels
+        Le pool grossit à la demande jusqu'à MAX_POOLED_PERSONS; au-delà,
+        les personnes sont allouées à chaque frame.
+        """
+        if index < len(pooled):
+            return pooled[index]
+        
+        person = DetectedPerson(
+            id=0,
+            bbox=(0, 0, 0, 0),
+            confidence=0.0,
+            distance_mm=0.0,
+            ppe_detected=PPEType.NONE,
+            ppe_missing=PPEType.NONE,
+            posture_risk=PostureRisk.LOW,
+            in_danger_zone=False,
+        )
+        if index < self.MAX_POOLED_PERSONS:
+            pooled.append(person)
+        return person
+    
+    async def _analyze_detections(self, frame: Any, yolo_result: Any) -> VisionResult:
+        """
+        Construit les DetectedPerson et la vue SoA à partir d'un résultat YOLO.
         
         Args:
-            height_px: Hauteur en pixels
+            frame: Image BGR source (np.ndarray ou GpuMat)
+            yolo_result: Résultat Ultralytics de cette frame
             
         Returns:
-            Distance estimée en mm
+            Résultat avec personnes et vue SoA (agrégats non calculés)
         """
-        if height_px <= 0:
-            return float('inf')
+        result, pooled = self._next_result()
+        persons = result.persons
+        boxes = yolo_result.boxes
+        
+        if len(boxes) == 0:
+            return result
+        
+        # Un seul transfert GPU -> CPU pour toutes les boxes
+        xyxy = boxes.xyxy.cpu().numpy()
+        transform = self._box_transform(frame)
+        if transform is not None:
+            scale, left, top = transform
+            xyxy = (xyxy - np.array([left, top, left, top], dtype=np.float32)) / scale
+            xyxy = np.maximum(xyxy, 0)
+        xyxy = xyxy.astype(np.int32)
+        confidences = boxes.conf.cpu().numpy()
+        ppe_missing_arr = np.zeros(len(xyxy), dtype=np.uint8)
+        
+        # Distance et posture vectorisées (focale ramenée à la frame traitée)
+        distances, risks = _postprocess_boxes(
+            xyxy,
+            self.config.focal_length_px * self._frame_scale,
+            self.config.known_height_mm,
+        )
         
-        distance = (self.config.known_height_mm * self.config.focal_length_px) / height_px
-        return max(0, distance)
+        for i, ((x1, y1, x2, y2), confidence, distance_mm, risk) in enumerate(zip(
+            xyxy.tolist(), confidences.tolist(), distances.tolist(), risks.tolist()
+        )):
+            # Vérifier EPI (simplifié - à améliorer avec modèle custom)
+            ppe_detected, ppe_missing = await self._check_ppe(
+                self._frame_roi(frame, x1, y1, x2, y2)
+            )
+            ppe_missing_arr[i] = ppe_missing
+            
+            self._person_id_counter += 1
+            
+            person = self._pooled_person(pooled, i)
+            person.id = self._person_id_counter
+            person.bbox = (x1, y1, x2, y2)
+            person.confidence = confidence
+            person.distance_mm = distance_mm
+            person.ppe_detected = ppe_detected
+            person.ppe_missing = ppe_missing
+            person.posture_risk = PostureRisk(risk)
+            person.in_danger_zone = distance_mm < 500
+            
+            persons.append(person)
+        
+        result.persons_detected = len(persons)
+        result.distances_mm = distances
+        result.confidences = confidences
+        result.ppe_missing = ppe_missing_arr
+        result.posture_risks = risks
+        return result
     
     async def _check_ppe(self, person_roi: np.ndarray) -> Tuple[PPEType, PPEType]:
         """
@@ -483,19 +1315,22 @@ class VisionAIDriver:
         detected = PPEType.NONE
         required = PPEType.SAFETY_GLASSES | PPEType.GLOVES  # EPI requis soudage
         
-        if person_roi.size == 0:
+        # ROI vide ou trop petite (personne lointaine): EPI non vérifiables
+        if person_roi.shape[0] * person_roi.shape[1] < self.PPE_MIN_ROI_AREA:
             return detected, required
         
         try:
             # Analyse basique couleur pour gilet haute visibilité
-            hsv = cv2.cvtColor(person_roi, cv2.COLOR_BGR2HSV)
+            # (ROI contiguë: évite la copie implicite de cvtColor)
+            roi = np.ascontiguousarray(person_roi)
+            hsv = cv2.cvtColor(roi, cv2.COLOR_BGR2HSV)
             
             # Détection jaune/orange (gilet)
-            lower_yellow = np.array([20, 100, 100])
-            upper_yellow = np.array([40, 255, 255])
-            mask_yellow = cv2.inRange(hsv, lower_yellow, upper_yellow)
+            mask_yellow = cv2.inRange(hsv, self.YELLOW_HSV_LO, self.YELLOW_HSV_HI)
             
-            if np.sum(mask_yellow) > 0.05 * mask_yellow.size * 255:
+            # countNonZero: une passe octet par octet, sans accumulation
+            # uint64 comme np.sum sur le masque
+            if cv2.countNonZero(mask_yellow) > 0.05 * mask_yellow.size:
                 detected |= PPEType.HIGH_VIS_VEST
             
             # Pour les autres EPI, un modèle dédié serait nécessaire
@@ -507,72 +1342,59 @@ class VisionAIDriver:
         missing = required & ~detected
         return detected, missing
     
-    def _analyze_posture(self, box) -> PostureRisk:
+    async def _notify_callbacks(self, result: VisionResult) -> None:
         """
-        Analyse basique de la posture.
+        Notifie les callbacks.
         
-        Args:
-            box: Bounding box YOLO
-            
-        Returns:
-            Niveau de risque posture
+        Les callbacks synchrones sont appelés sur la boucle, dans l'ordre
+        d'enregistrement, avec les objets du pool. Les callbacks async, et
+        les synchrones enregistrés avec offload=True (dans l'executor, sur
+        une copie détachée du pool), sont lancés ensemble.
         """
-        # Version simplifiée basée sur le ratio largeur/hauteur
-        # En production: utiliser MediaPipe ou modèle pose estimation
-        
-        try:
-            x1, y1, x2, y2 = map(int, box.xyxy[0].tolist())
-            width = x2 - x1
-            height = y2 - y1
-            
-            if height == 0:
-                return PostureRisk.LOW
-            
-            ratio = width / height
-            
-            # Ratio normal debout: ~0.3-0.4
-            # Ratio penché/accroupi: >0.5
-            if ratio > 0.7:
-                return PostureRisk.HIGH
-            elif ratio > 0.5:
-                return PostureRisk.MEDIUM
-            else:
-                return PostureRisk.LOW
-                
-        except Exception:
-            return PostureRisk.LOW
-    
-    async def _notify_callbacks(self, result: VisionResult) -> None:
-        """Notifie les callbacks."""
-        # Callback résultat
-        for callback in self._on_result:
-            try:
-                if asyncio.iscoroutinefunction(callback):
-                    await callback(result)
-                else:
-                    callback(result)
-            except Exception as e:
-                logger.error("vision_callback_error", error=str(e))
+        calls: List[Tuple[str, Callable, tuple]] = [
+            ("result", callback, (result,)) for callback in self._on_result
+        ]
         
         # Callbacks intrusion
         if result.intrusion_detected:
-            for person in result.persons:
-                if person.in_danger_zone:
-                    for callback in self._on_intrusion:
-                        try:
-                            callback(person)
-                        except Exception:
-                            pass
+            calls.extend(
+                ("intrusion", callback, (person,))
+                for person in result.persons if person.in_danger_zone
+                for callback in self._on_intrusion
+            )
         
         # Callbacks EPI
         if result.ppe_alert:
-            for person in result.persons:
-                if person.ppe_missing != PPEType.NONE:
-                    for callback in self._on_ppe_alert:
-                        try:
-                            callback(person, person.ppe_missing)
-                        except Exception:
-                            pass
+            calls.extend(
+                ("ppe", callback, (person, person.ppe_missing))
+                for person in result.persons if person.ppe_missing != PPEType.NONE
+                for callback in self._on_ppe_alert
+            )
+        
+        pending: List[Tuple[str, Any]] = []
+        for kind, callback, args in calls:
+            if isinstance(callback, _OffloadedCallback):
+                pending.append((kind, asyncio.get_running_loop().run_in_executor(
+                    None, callback.callback, *copy.deepcopy(args)
+                )))
+            elif asyncio.iscoroutinefunction(callback):
+                pending.append((kind, callback(*args)))
+            else:
+                try:
+                    callback(*args)
+                except Exception as e:
+                    logger.error("vision_callback_error", callback=kind, error=str(e))
+        
+        if not pending:
+            return
+        
+        outcomes = await asyncio.gather(
+            *(awaitable for _, awaitable in pending), return_exceptions=True
+        )
+        
+        for (kind, _), outcome in zip(pending, outcomes):
+            if isinstance(outcome, Exception):
+                logger.error("vision_callback_error", callback=kind, error=str(outcome))
     
     async def start_processing(self, interval_ms: float = 33) -> None:
         """Démarre le traitement continu."""
@@ -597,24 +1419,156 @@ class VisionAIDriver:
         logger.info("vision_processing_stopped")
     
     async def _processing_loop(self, interval: float) -> None:
-        """Boucle de traitement."""
+        """
+        Boucle de traitement en pipeline.
+        
+        Trois tâches reliées par des files bornées:
+        capture -> inférence (lots de `batch_size`) -> post-traitement.
+        La caméra lit la frame suivante pendant que YOLO tourne, et la
+        latence par frame tend vers l'étape la plus lente plutôt que
+        vers la somme des étapes.
+        """
+        cap_queue: asyncio.Queue = asyncio.Queue(maxsize=max(2, self.config.batch_size))
+        post_queue: asyncio.Queue = asyncio.Queue(maxsize=2)
+        
+        workers = [
+            asyncio.create_task(self._capture_worker(cap_queue, interval)),
+            asyncio.create_task(self._infer_worker(cap_queue, post_queue)),
+            asyncio.create_task(self._post_worker(post_queue)),
+        ]
+        
+        try:
+            await asyncio.gather(*workers)
+        finally:
+            for worker in workers:
+                worker.cancel()
+    
+    async def _capture_worker(self, cap_queue: asyncio.Queue, interval: float) -> None:
+        """
+        Capture les frames vers la file d'inférence.
+        
+        Si la file est pleine, la frame la plus ancienne est jetée pour ne
+        pas accumuler de latence derrière une inférence lente. En surcharge
+        (EWMA du temps de traitement au-delà de la cible), une frame sur
+        deux est sautée dès la caméra, sans décodage. L'attente entre
+        captures est réduite du temps de capture pour tenir l'intervalle.
+        """
+        loop = asyncio.get_event_loop()
+        skip_next = False
+        
         while self._running:
+            start_ns = time.monotonic_ns()
+            
             if self.is_connected:
-                await self.process_frame()
+                try:
+                    self._update_overload(interval)
+                    
+                    if skip_next:
+                        skip_next = False
+                        await loop.run_in_executor(self._cam_exec, self._skip_frame)
+                    else:
+                        skip_next = self._overloaded
+                        frame = await loop.run_in_executor(self._cam_exec, self._capture)
+                        
+                        if frame is not None:
+                            self._frame_count += 1
+                            if cap_queue.full():
+                                cap_queue.get_nowait()
+                            cap_queue.put_nowait((start_ns, frame))
+                        
+                except Exception as e:
+                    logger.warning("vision_capture_error", error=str(e))
             
-            await asyncio.sleep(interval)
+            elapsed = (time.monotonic_ns() - start_ns) / 1e9
+            await asyncio.sleep(max(0.0, interval - elapsed))
     
-    def on_result(self, callback: Callable[[VisionResult], None]) -> None:
-        """Ajoute un callback pour les résultats."""
-        self._on_result.append(callback)
+    def _update_overload(self, interval: float) -> None:
+        """Met à jour l'état de surcharge et journalise ses transitions."""
+        target_ms = interval * 1000
+        overloaded = self._ewma_ms > self.OVERLOAD_FACTOR * target_ms
+        
+        if overloaded != self._overloaded:
+            self._overloaded = overloaded
+            if overloaded:
+                logger.warning(
+                    "vision_overload",
+                    ewma_ms=round(self._ewma_ms, 1),
+                    target_ms=target_ms,
+                )
+            else:
+                logger.info("vision_overload_cleared", ewma_ms=round(self._ewma_ms, 1))
     
-    def on_intrusion(self, callback: Callable[[DetectedPerson], None]) -> None:
-        """Ajoute un callback pour les intrusions."""
-        self._on_intrusion.append(callback)
+    def _skip_frame(self) -> None:
+        """Avance la source d'une frame sans la décoder (thread caméra)."""
+        if self._gpu_reader is not None:
+            self._gpu_reader.grab()
+        else:
+            self._cap.grab()
     
-    def on_ppe_alert(self, callback: Callable[[DetectedPerson, PPEType], None]) -> None:
-        """Ajoute un callback pour les alertes EPI."""
-        self._on_ppe_alert.append(callback)
+    async def _infer_worker(self, cap_queue: asyncio.Queue, post_queue: asyncio.Queue) -> None:
+        """Regroupe jusqu'à `batch_size` frames et les passe à YOLO en un appel."""
+        loop = asyncio.get_event_loop()
+        
+        while self._running:
+            batch = [await cap_queue.get()]
+            while len(batch) < self.config.batch_size and not cap_queue.empty():
+                batch.append(cap_queue.get_nowait())
+            
+            try:
+                results: List[Any] = [None] * len(batch)
+                
+                if self._yolo_model is not None:
+                    frames = [frame for _, frame in batch]
+                    results = await loop.run_in_executor(self._gpu_exec, self._infer, frames)
+                
+                await post_queue.put((batch, results))
+                
+            except Exception as e:
+                logger.warning("yolo_detection_error", error=str(e), batch_size=len(batch))
+    
+    async def _post_worker(self, post_queue: asyncio.Queue) -> None:
+        """Construit les VisionResult et notifie, dans l'ordre de capture."""
+        while self._running:
+            batch, results = await post_queue.get()
+            
+            for (start_ns, frame), yolo_result in zip(batch, results):
+                try:
+                    if yolo_result is not None:
+                        result = await self._analyze_detections(frame, yolo_result)
+                    else:
+                        result = self._next_result()[0]
+                    
+                    self._finalize_result(result, start_ns)
+                    self._current_result = result
+                    await self._notify_callbacks(result)
+                    
+                except Exception as e:
+                    logger.warning("vision_process_error", error=str(e))
+    
+    def on_result(
+        self, callback: Callable[[VisionResult], None], offload: bool = False
+    ) -> None:
+        """
+        Ajoute un callback pour les résultats.
+        
+        Args:
+            callback: Appelé sur la boucle d'événements (ou awaité si async)
+            offload: Callback synchrone lent (I/O) exécuté dans l'executor,
+                sur une copie détachée du pool
+        """
+        self._on_result.append(_OffloadedCallback(callback) if offload else callback)
+    
+    def on_intrusion(
+        self, callback: Callable[[DetectedPerson], None], offload: bool = False
+    ) -> None:
+        """Ajoute un callback pour les intrusions (offload: voir on_result)."""
+        self._on_intrusion.append(_OffloadedCallback(callback) if offload else callback)
+    
+    def on_ppe_alert(
+        self, callback: Callable[[DetectedPerson, PPEType], None], offload: bool = False
+    ) -> None:
+        """Ajoute un callback pour les alertes EPI (offload: voir on_result)."""
+        self._on_ppe_alert.append(_OffloadedCallback(callback) if offload else callback)
     
     def calibrate_distance(self, known_distance_mm: float, measured_height_px: int) -> None:
         """
@@ -622,12 +1576,14 @@ class VisionAIDriver:
         
         Args:
             known_distance_mm: Distance réelle mesurée
-            measured_height_px: Hauteur mesurée en pixels
+            measured_height_px: Hauteur mesurée en pixels de la frame traitée
+                (bbox des détections, après sous-échantillonnage)
         """
-        # focale = (hauteur_px × distance) / hauteur_réelle
+        # focale = (hauteur_px × distance) / hauteur_réelle, ramenée à la
+        # résolution native
         self.config.focal_length_px = (
             measured_height_px * known_distance_mm
-        ) / self.config.known_height_mm
+        ) / (self.config.known_height_mm * self._frame_scale)
         
         logger.info(
             "vision_distance_calibrated",
@@ -642,7 +1598,10 @@ class VisionSimulator:
     
     def __init__(self, config: Optional[VisionConfig] = None):
         self.config = config or VisionConfig()
+        self._connected = False
         self._running = False
+        self._process_task: Optional[asyncio.Task] = None
+        self._rng = random.Random(self.config.rng_seed)
         self._result = VisionResult()
         self._callbacks_result: List[Callable] = []
         self._callbacks_intrusion: List[Callable] = []
@@ -651,33 +1610,48 @@ class VisionSimulator:
     
     @property
     def is_connected(self) -> bool:
-        return self._running
+        return self._connected
     
     @property
     def current_result(self) -> VisionResult:
         return self._result
     
     async def connect(self) -> bool:
-        self._running = True
+        self._connected = True
         logger.info("vision_simulator_connected")
         return True
     
     async def disconnect(self) -> None:
-        self._running = False
+        await self.stop_processing()
+        self._connected = False
         logger.info("vision_simulator_disconnected")
     
     async def start_processing(self, interval_ms: float = 33) -> None:
-        asyncio.create_task(self._simulation_loop(interval_ms / 1000.0))
+        if self._running:
+            return
+        
+        self._running = True
+        self._process_task = asyncio.create_task(
+            self._simulation_loop(interval_ms / 1000.0)
+        )
     
     async def stop_processing(self) -> None:
+        # Comme VisionAIDriver: arrête la boucle sans déconnecter
         self._running = False
+        if self._process_task:
+            self._process_task.cancel()
+            try:
+                await self._process_task
+            except asyncio.CancelledError:
+                pass
+            self._process_task = None
     
     async def _simulation_loop(self, interval: float) -> None:
-        import random
+        rng = self._rng
         
         while self._running:
             # Simuler différents scénarios
-            scenario = random.random()
+            scenario = rng.random()
             
             persons = []
             
@@ -688,8 +1662,8 @@ class VisionSimulator:
                 persons.append(DetectedPerson(
                     id=self._person_id,
                     bbox=(100, 100, 200, 400),
-                    confidence=random.uniform(0.7, 0.95),
-                    distance_mm=random.uniform(2000, 5000),
+                    confidence=rng.uniform(0.7, 0.95),
+                    distance_mm=rng.uniform(2000, 5000),
                     ppe_detected=PPEType.SAFETY_GLASSES | PPEType.GLOVES,
                     ppe_missing=PPEType.NONE,
                     posture_risk=PostureRisk.LOW,
@@ -697,11 +1671,11 @@ class VisionSimulator:
                 ))
             elif scenario < 0.95:  # 10% - 1 personne proche
                 self._person_id += 1
-                distance = random.uniform(500, 1500)
+                distance = rng.uniform(500, 1500)
                 persons.append(DetectedPerson(
                     id=self._person_id,
                     bbox=(300, 50, 500, 500),
-                    confidence=random.uniform(0.8, 0.98),
+                    confidence=rng.uniform(0.8, 0.98),
                     distance_mm=distance,
                     ppe_detected=PPEType.SAFETY_GLASSES,
                     ppe_missing=PPEType.GLOVES,
@@ -713,8 +1687,8 @@ class VisionSimulator:
                 persons.append(DetectedPerson(
                     id=self._person_id,
                     bbox=(400, 0, 700, 600),
-                    confidence=random.uniform(0.85, 0.99),
-                    distance_mm=random.uniform(200, 700),
+                    confidence=rng.uniform(0.85, 0.99),
+                    distance_mm=rng.uniform(200, 700),
                     ppe_detected=PPEType.NONE,
                     ppe_missing=PPEType.SAFETY_GLASSES | PPEType.GLOVES,
                     posture_risk=PostureRisk.HIGH,
@@ -726,7 +1700,7 @@ class VisionSimulator:
                 timestamp=datetime.now(),
                 persons_detected=len(persons),
                 persons=persons,
-                processing_time_ms=random.uniform(15, 35),
+                processing_time_ms=rng.uniform(15, 35),
             )
             
             if persons:
@@ -734,13 +1708,16 @@ class VisionSimulator:
                 self._result.closest_person_id = min(persons, key=lambda p: p.distance_mm).id
                 self._result.confidence_avg = sum(p.confidence for p in persons) / len(persons)
                 
-                missing = PPEType.NONE
-                for p in persons:
-                    missing |= p.ppe_missing
+                # Agrégation en bloc (OU binaire / max) sur tableaux uint8
+                n = len(persons)
+                ppe_missing = np.fromiter((p.ppe_missing for p in persons), dtype=np.uint8, count=n)
+                posture_risks = np.fromiter((p.posture_risk for p in persons), dtype=np.uint8, count=n)
+                
+                missing = PPEType(int(np.bitwise_or.reduce(ppe_missing)))
                 self._result.missing_ppe_types = missing
                 self._result.all_ppe_ok = missing == PPEType.NONE
                 self._result.ppe_alert = not self._result.all_ppe_ok
-                self._result.max_posture_risk = max(p.posture_risk for p in persons)
+                self._result.max_posture_risk = PostureRisk(int(posture_risks.max()))
                 self._result.posture_alert = self._result.max_posture_risk >= PostureRisk.HIGH
                 self._result.intrusion_detected = any(p.in_danger_zone for p in persons)
             
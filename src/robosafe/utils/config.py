@@ -1,19 +1,79 @@
 """
 Gestion de la configuration RoboSafe.
 
-Charge et valide la configuration depuis fichiers YAML.
+Charge et valide la configuration depuis fichiers YAML ou JSON.
 """
 
+import json
+import mmap
+import os
+import tempfile
+from contextlib import contextmanager
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
-import yaml
-from pydantic import BaseModel, Field, field_validator
+import structlog
+from pydantic import BaseModel, ConfigDict, Field, field_validator
 from pydantic_settings import BaseSettings
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+    orjson = None
+
+logger = structlog.get_logger(__name__)
+
+# Version du format du cache .cache.json (à incrémenter si le format change)
+_CACHE_VERSION = 2
+
+# Au-delà de cette taille, les fichiers sont lus via mmap (pas de copie en tas)
+_MMAP_THRESHOLD = 64 * 1024
+
+# Sections immuables une fois chargées (les clés inconnues restent ignorées:
+# production.yaml porte des sections consommées ailleurs)
+_SECTION_CONFIG = ConfigDict(frozen=True)
+
+# Valeurs par défaut des champs mutables: copiées par instance via .copy()
+# (plus rapide qu'un littéral reconstruit par une lambda), jamais modifiées
+_DEFAULT_ZONES: Dict[str, int] = {"warn": 1200, "protect": 500}
+_DEFAULT_CORS: List[str] = ["*"]
+
+
+@lru_cache(maxsize=1)
+def _get_yaml() -> Tuple[Any, Any, Any]:
+    """
+    Importe PyYAML à la première lecture/écriture YAML.
+    
+    Évite ~15 ms d'import au démarrage (CLI --help/--version, fichiers
+    JSON, cache YAML valide).
+    
+    Returns:
+        (module yaml, Loader, Dumper), versions C (libyaml) si disponibles
+    """
+    import yaml
+    
+    if not yaml.__with_libyaml__:
+        logger.warning(
+            "libyaml_not_available",
+            using="pure_python_yaml",
+            hint="installer libyaml puis réinstaller pyyaml",
+        )
+    
+    return (
+        yaml,
+        getattr(yaml, "CSafeLoader", yaml.SafeLoader),
+        getattr(yaml, "CSafeDumper", yaml.SafeDumper),
+    )
+
 
 class CellConfig(BaseModel):
     """Configuration de la cellule."""
+    
+    model_config = _SECTION_CONFIG
+    
     id: str = "CELL-001"
     name: str = "Cellule robotisée"
     type: str = "generic"  # welding, assembly, palletizing, etc.
@@ -21,6 +81,9 @@ class CellConfig(BaseModel):
 
 class RobotConfig(BaseModel):
     """Configuration du robot."""
+    
+    model_config = _SECTION_CONFIG
+    
     type: str = "fanuc"
     model: str = "ARC Mate 100iD"
     ip: str = "192.168.1.10"
@@ -31,6 +94,9 @@ class RobotConfig(BaseModel):
 
 class PLCConfig(BaseModel):
     """Configuration du PLC sécurité."""
+    
+    model_config = _SECTION_CONFIG
+    
     type: str = "siemens"
     model: str = "S7-1500F"
     ip: str = "192.168.1.20"
@@ -41,17 +107,20 @@ class PLCConfig(BaseModel):
 
 class ScannerConfig(BaseModel):
     """Configuration d'un scanner laser."""
+    
+    model_config = _SECTION_CONFIG
+    
     id: str
     type: str = "sick_microscan3"
     ip: str = "192.168.1.30"
-    zones: Dict[str, int] = Field(default_factory=lambda: {
-        "warn": 1200,
-        "protect": 500,
-    })
+    zones: Dict[str, int] = Field(default_factory=_DEFAULT_ZONES.copy)
 
 
 class VisionConfig(BaseModel):
     """Configuration de la vision IA."""
+    
+    model_config = _SECTION_CONFIG
+    
     enabled: bool = True
     ip: str = "192.168.1.40"
     model: str = "basler_ace2"
@@ -62,6 +131,9 @@ class VisionConfig(BaseModel):
 
 class FumesConfig(BaseModel):
     """Configuration du capteur fumées."""
+    
+    model_config = _SECTION_CONFIG
+    
     enabled: bool = True
     ip: str = "192.168.1.50"
     protocol: str = "modbus_tcp"
@@ -78,6 +150,9 @@ class FumesConfig(BaseModel):
 class ThresholdsConfig(BaseModel):
     """Seuils de sécurité."""
     
+    model_config = _SECTION_CONFIG
+    
+    
     # Distance (mm)
     distance_stop: int = 800
     distance_slow: int = 1500
@@ -94,6 +169,9 @@ class ThresholdsConfig(BaseModel):
 
 class LoggingConfig(BaseModel):
     """Configuration du logging."""
+    
+    model_config = _SECTION_CONFIG
+    
     level: str = "INFO"
     format: str = "json"  # json, console
     output: str = "logs/robosafe.log"
@@ -103,13 +181,24 @@ class LoggingConfig(BaseModel):
 
 class APIConfig(BaseModel):
     """Configuration de l'API."""
+    
+    model_config = _SECTION_CONFIG
+    
     host: str = "0.0.0.0"
     port: int = 8080
-    cors_origins: List[str] = Field(default_factory=lambda: ["*"])
+    cors_origins: List[str] = Field(default_factory=_DEFAULT_CORS.copy)
 
 
-class RoboSafeConfig(BaseSettings):
-    """Configuration complète RoboSafe."""
+class RoboSafeConfigModel(BaseModel):
+    """
+    Configuration complète RoboSafe (modèle simple).
+    
+    Utilisé pour les chargements depuis fichier: pas de lecture des
+    variables d'environnement ni du .env à chaque validation.
+    """
+    
+    model_config = _SECTION_CONFIG
+    
     
     cell: CellConfig = Field(default_factory=CellConfig)
     robot: RobotConfig = Field(default_factory=RobotConfig)
@@ -120,45 +209,179 @@ class RoboSafeConfig(BaseSettings):
     thresholds: ThresholdsConfig = Field(default_factory=ThresholdsConfig)
     logging: LoggingConfig = Field(default_factory=LoggingConfig)
     api: APIConfig = Field(default_factory=APIConfig)
+
+
+class RoboSafeConfig(BaseSettings, RoboSafeConfigModel):
+    """Configuration complète RoboSafe, surchargée par les variables ROBOSAFE_*."""
     
     class Config:
         env_prefix = "ROBOSAFE_"
         env_nested_delimiter = "__"
 
 
-def load_config(path: Path) -> RoboSafeConfig:
+# Validateurs pydantic-core construits une fois avec les modèles
+_MODEL_VALIDATOR = RoboSafeConfigModel.__pydantic_validator__
+_SETTINGS_VALIDATOR = RoboSafeConfig.__pydantic_validator__
+
+
+def load_config(path: Path, use_env: bool = False) -> RoboSafeConfigModel:
     """
-    Charge la configuration depuis un fichier YAML.
+    Charge la configuration depuis un fichier YAML ou JSON.
+    
+    Le format est choisi par l'extension: `.json` (orjson si disponible,
+    nettement plus rapide que YAML même avec libyaml), sinon YAML.
     
     Args:
-        path: Chemin vers le fichier YAML
+        path: Chemin vers le fichier YAML ou JSON
+        use_env: Appliquer aussi les variables ROBOSAFE_* / .env
+            (RoboSafeConfig, plus coûteux); sinon modèle simple
         
     Returns:
         Configuration validée
     """
-    with open(path, "r", encoding="utf-8") as f:
-        data = yaml.safe_load(f)
+    path = Path(path)
     
-    return RoboSafeConfig(**data)
+    if path.suffix == ".json":
+        if path.stat().st_size > _MMAP_THRESHOLD:
+            with _mapped(path) as mm, memoryview(mm) as view:
+                data = _json_loads(view)
+        else:
+            data = _json_loads(path.read_bytes())
+    else:
+        data = _read_yaml_cached(path)
+    
+    if use_env:
+        return _SETTINGS_VALIDATOR.validate_python(data)
+    return _MODEL_VALIDATOR.validate_python(data)
 
 
-def save_config(config: RoboSafeConfig, path: Path) -> None:
+def _read_yaml_cached(path: Path) -> Dict[str, Any]:
     """
-    Sauvegarde la configuration dans un fichier YAML.
+    Lit un fichier YAML via un cache JSON à côté du fichier.
+    
+    Le cache (`<fichier>.cache.json`) contient les données brutes, validées
+    par (version, mtime_ns, taille) du YAML: tout changement du fichier le
+    rend caduc. JSON et non pickle: un cache modifiable par un tiers ne
+    doit jamais pouvoir exécuter de code. Seul le parsing YAML est évité;
+    la validation pydantic reste appliquée.
+    
+    Args:
+        path: Chemin vers le fichier YAML
+        
+    Returns:
+        Données YAML brutes
+    """
+    stat = path.stat()
+    key = [_CACHE_VERSION, stat.st_mtime_ns, stat.st_size]
+    cache_path = path.with_suffix(path.suffix + ".cache.json")
+    
+    try:
+        cached = _json_loads(cache_path.read_bytes())
+        if cached.get("key") == key:
+            return cached["data"]
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        logger.debug("config_cache_invalid", path=str(cache_path), error=str(e))
+    
+    yaml, loader, _ = _get_yaml()
+    if stat.st_size > _MMAP_THRESHOLD:
+        with _mapped(path) as mm:
+            data = yaml.load(mm, Loader=loader) or {}
+    else:
+        with open(path, "r", encoding="utf-8") as f:
+            data = yaml.load(f, Loader=loader) or {}
+    
+    _write_yaml_cache(cache_path, key, data)
+    return data
+
+
+def _write_yaml_cache(cache_path: Path, key: List[int], data: Dict[str, Any]) -> None:
+    """
+    Écrit le cache JSON de façon atomique (fichier temporaire unique + replace).
+    
+    Rien n'est écrit si les données ne survivent pas telles quelles à un
+    aller-retour JSON (dates, clés non-str, tuples YAML...).
+    """
+    try:
+        raw = json.dumps({"key": key, "data": data}, ensure_ascii=False)
+        if json.loads(raw)["data"] != data:
+            return
+    except (TypeError, ValueError):
+        return
+    
+    tmp_name = None
+    try:
+        with tempfile.NamedTemporaryFile(
+            "w", encoding="utf-8", dir=cache_path.parent,
+            prefix=cache_path.name + ".", suffix=".tmp", delete=False,
+        ) as f:
+            tmp_name = f.name
+            f.write(raw)
+        os.replace(tmp_name, cache_path)
+    except OSError as e:
+        logger.debug("config_cache_write_failed", path=str(cache_path), error=str(e))
+        if tmp_name is not None:
+            try:
+                os.unlink(tmp_name)
+            except OSError:
+                pass
+
+
+def save_config(config: RoboSafeConfigModel, path: Path, exclude_defaults: bool = True) -> None:
+    """
+    Sauvegarde la configuration dans un fichier YAML ou JSON (selon l'extension).
+    
+    Le JSON est produit directement par le sérialiseur Rust de pydantic
+    (une seule traversée). Par défaut seules les valeurs différentes des
+    défauts sont écrites: fichier plus court, relu plus vite.
     
     Args:
         config: Configuration à sauvegarder
         path: Chemin de destination
+        exclude_defaults: Omettre les champs à leur valeur par défaut
     """
-    data = config.model_dump()
+    path = Path(path)
+    
+    if path.suffix == ".json":
+        path.write_text(
+            config.model_dump_json(indent=2, exclude_defaults=exclude_defaults),
+            encoding="utf-8",
+        )
+        return
     
+    data = config.model_dump(mode="json", exclude_defaults=exclude_defaults)
+    yaml, _, dumper = _get_yaml()
     with open(path, "w", encoding="utf-8") as f:
-        yaml.dump(data, f, default_flow_style=False, allow_unicode=True)
+        yaml.dump(data, f, Dumper=dumper, default_flow_style=False, allow_unicode=True)
+
+
+@contextmanager
+def _mapped(path: Path) -> Iterator[mmap.mmap]:
+    """
+    Projette un fichier en mémoire, en lecture seule.
+    
+    Les pages sont lues à la demande par le noyau, sans copie dans le tas
+    Python; la lecture séquentielle et le préchargement sont annoncés
+    (madvise) quand la plateforme le permet.
+    """
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        for advice in ("MADV_SEQUENTIAL", "MADV_WILLNEED"):
+            if hasattr(mmap, advice):
+                mm.madvise(getattr(mmap, advice))
+        yield mm
+
+
+def _json_loads(raw: Any) -> Dict[str, Any]:
+    """Décode un document JSON, bytes ou memoryview (orjson si disponible)."""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(raw)
+    return json.loads(bytes(raw))
 
 
-def create_example_config(path: Path) -> None:
-    """Crée un fichier de configuration exemple."""
-    config = RoboSafeConfig(
+def create_example_config(path: Path = Path("config/config.example.json")) -> None:
+    """Crée un fichier de configuration exemple (JSON par défaut, YAML si .yaml)."""
+    config = RoboSafeConfigModel(
         cell=CellConfig(
             id="WELD-MIG-001",
             name="Cellule Soudage MIG",
@@ -170,4 +393,5 @@ def create_example_config(path: Path) -> None:
         ],
     )
     
-    save_config(config, path)
+    # Exemple complet: tous les champs, y compris les valeurs par défaut
+    save_config(config, path, exclude_defaults=False)
@@ -4,24 +4,66 @@ Configuration du logging structuré RoboSafe.
 Utilise structlog pour un logging JSON adapté à l'observabilité.
 """
 
+import atexit
+import json
 import logging
+import logging.handlers
+import queue
 import sys
-from datetime import datetime
+import time
 from pathlib import Path
-from typing import Optional
+from typing import Any, Optional
 
 import structlog
 from structlog.types import Processor
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+    orjson = None
 
-def add_timestamp(
-    logger: logging.Logger,
-    method_name: str,
-    event_dict: dict,
-) -> dict:
-    """Ajoute un timestamp ISO."""
-    event_dict["timestamp"] = datetime.now().isoformat()
-    return event_dict
+
+class UtcTimestamper:
+    """
+    Ajoute un timestamp ISO 8601 UTC (microsecondes), ex. 2024-01-01T12:00:00.123456Z.
+    
+    La partie date/heure n'est recalculée qu'une fois par seconde; chaque
+    événement ne fait qu'un time.time_ns() et un formatage des
+    microsecondes (plus rapide que datetime.now().isoformat() et que
+    structlog.processors.TimeStamper).
+    """
+    
+    __slots__ = ("_cached",)
+    
+    def __init__(self) -> None:
+        # (seconde, préfixe) en un seul attribut: instance partagée entre
+        # threads, lue et remplacée en une seule opération
+        self._cached = (-1, "")
+    
+    def __call__(
+        self,
+        logger: logging.Logger,
+        method_name: str,
+        event_dict: dict,
+    ) -> dict:
+        second, fraction_ns = divmod(time.time_ns(), 1_000_000_000)
+        cached_second, prefix = self._cached
+        if second != cached_second:
+            prefix = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(second))
+            self._cached = (second, prefix)
+        event_dict["timestamp"] = f"{prefix}.{fraction_ns // 1000:06d}Z"
+        return event_dict
+
+
+SERVICE_NAME = "robosafe-sentinel"
+
+# Thread d'écriture du fichier de log (QueueListener), un seul actif
+_queue_listener: Optional[logging.handlers.QueueListener] = None
+
+# Handler stdout des loggers stdlib installé par setup_logging
+_stdout_handler: Optional[logging.Handler] = None
 
 
 def add_service_info(
@@ -29,11 +71,57 @@ def add_service_info(
     method_name: str,
     event_dict: dict,
 ) -> dict:
-    """Ajoute les infos du service."""
-    event_dict["service"] = "robosafe-sentinel"
+    """Ajoute les infos du service (tout thread, y compris records stdlib)."""
+    event_dict["service"] = SERVICE_NAME
     return event_dict
 
 
+def _orjson_dumps(obj: Any, **kwargs: Any) -> bytes:
+    """
+    Sérialiseur orjson des événements structlog.
+    
+    Clés non-str acceptées; ce qu'orjson refuse encore (entiers > 64 bits...)
+    repasse par json.dumps: une erreur de sérialisation ne doit jamais
+    remonter d'un appel de log.
+    """
+    try:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS, **kwargs)
+    except TypeError:
+        pass
+    try:
+        return json.dumps(obj, **kwargs).encode("utf-8")
+    except (TypeError, ValueError) as e:
+        # Dernier recours (références circulaires...): l'événement seul
+        return json.dumps({
+            "event": str(obj.get("event")),
+            "log_serialization_error": repr(e),
+        }).encode("utf-8")
+
+
+def _orjson_dumps_str(obj: Any, **kwargs: Any) -> str:
+    """Sérialiseur orjson pour les formatters stdlib (qui attendent un str)."""
+    return _orjson_dumps(obj, **kwargs).decode("utf-8")
+
+
+# Chaînes de processors construites une fois (tuples immuables)
+_SHARED_PROCESSORS: tuple[Processor, ...] = (
+    structlog.contextvars.merge_contextvars,
+    structlog.processors.add_log_level,
+    UtcTimestamper(),
+    add_service_info,
+    structlog.processors.StackInfoRenderer(),
+    structlog.processors.format_exc_info,
+)
+
+if ORJSON_AVAILABLE:
+    _JSON_RENDERER = structlog.processors.JSONRenderer(serializer=_orjson_dumps)
+    _JSON_STDLIB_RENDERER = structlog.processors.JSONRenderer(serializer=_orjson_dumps_str)
+else:
+    _JSON_RENDERER = _JSON_STDLIB_RENDERER = structlog.processors.JSONRenderer()
+
+_JSON_PROCESSORS: tuple[Processor, ...] = _SHARED_PROCESSORS + (_JSON_RENDERER,)
+
+
 def setup_logging(
     level: str = "INFO",
     format: str = "json",
@@ -47,51 +135,48 @@ def setup_logging(
         format: Format de sortie (json, console)
         log_file: Fichier de sortie optionnel
     """
-    # Processors communs
-    shared_processors: list[Processor] = [
-        structlog.contextvars.merge_contextvars,
-        structlog.processors.add_log_level,
-        add_timestamp,
-        add_service_info,
-        structlog.processors.StackInfoRenderer(),
-        structlog.processors.format_exc_info,
-    ]
+    min_level = getattr(logging, level.upper())
+    shared_processors = _SHARED_PROCESSORS
     
     if format == "json":
         # Format JSON pour production
-        processors = shared_processors + [
-            structlog.processors.JSONRenderer()
-        ]
+        processors = _JSON_PROCESSORS
+        stdlib_renderer = file_renderer = _JSON_STDLIB_RENDERER
+        # orjson: bytes écrits tels quels sur stdout (ni décodage ni ré-encodage)
+        logger_factory = (
+            structlog.BytesLoggerFactory() if ORJSON_AVAILABLE else structlog.PrintLoggerFactory()
+        )
     else:
-        # Format console pour développement
-        processors = shared_processors + [
-            structlog.dev.ConsoleRenderer(colors=True)
-        ]
+        # Format console pour développement (sans couleurs dans le fichier).
+        # ConsoleRenderer est créé ici: avec couleurs, il exige colorama
+        # sous Windows, ce qui ne doit pas bloquer l'import du module
+        stdlib_renderer = structlog.dev.ConsoleRenderer(colors=True)
+        file_renderer = structlog.dev.ConsoleRenderer(colors=False)
+        processors = shared_processors + (stdlib_renderer,)
+        logger_factory = structlog.PrintLoggerFactory()
     
     # Configurer structlog
     structlog.configure(
         processors=processors,
-        wrapper_class=structlog.make_filtering_bound_logger(
-            getattr(logging, level.upper())
-        ),
+        # Méthodes sous le seuil remplacées par des no-op à la création de
+        # la classe: aucun processor n'est exécuté pour un événement filtré
+        wrapper_class=structlog.make_filtering_bound_logger(min_level),
         context_class=dict,
-        logger_factory=structlog.PrintLoggerFactory(),
+        logger_factory=logger_factory,
         cache_logger_on_first_use=True,
     )
     
-    # Configurer logging standard aussi (pour libs externes)
-    logging.basicConfig(
-        format="%(message)s",
-        stream=sys.stdout,
-        level=getattr(logging, level.upper()),
-    )
+    # Logging standard (libs externes): même enrichissement et même rendu
+    # que structlog, en une seule passe de formatage
+    _install_stdout_handler(_processor_formatter(shared_processors, stdlib_renderer), min_level)
     
     # Fichier si demandé
     if log_file:
-        log_file.parent.mkdir(parents=True, exist_ok=True)
-        handler = logging.FileHandler(log_file, encoding="utf-8")
-        handler.setLevel(getattr(logging, level.upper()))
-        logging.getLogger().addHandler(handler)
+        _start_file_listener(
+            log_file, min_level, _processor_formatter(shared_processors, file_renderer)
+        )
+    else:
+        stop_file_listener()
     
     structlog.get_logger().info(
         "logging_configured",
@@ -99,3 +184,95 @@ def setup_logging(
         format=format,
         log_file=str(log_file) if log_file else None,
     )
+
+
+def _processor_formatter(
+    shared_processors: tuple[Processor, ...],
+    renderer: Processor,
+) -> logging.Formatter:
+    """Formatter stdlib rendant les records via la chaîne structlog."""
+    return structlog.stdlib.ProcessorFormatter(
+        foreign_pre_chain=shared_processors,
+        processors=[
+            structlog.stdlib.ProcessorFormatter.remove_processors_meta,
+            renderer,
+        ],
+    )
+
+
+def _install_stdout_handler(formatter: logging.Formatter, min_level: int) -> None:
+    """
+    Installe (ou remplace) le handler stdout du logger racine.
+    
+    Args:
+        formatter: ProcessorFormatter structlog
+        min_level: Niveau minimal
+    """
+    global _stdout_handler
+    
+    root = logging.getLogger()
+    if _stdout_handler is not None:
+        root.removeHandler(_stdout_handler)
+    
+    _stdout_handler = logging.StreamHandler(sys.stdout)
+    _stdout_handler.setFormatter(formatter)
+    root.addHandler(_stdout_handler)
+    root.setLevel(min_level)
+
+
+def _start_file_listener(
+    log_file: Path,
+    min_level: int,
+    formatter: logging.Formatter,
+) -> None:
+    """
+    Écrit le fichier de log depuis un thread dédié.
+    
+    Le logger racine ne reçoit qu'un QueueHandler (simple mise en file);
+    l'ouverture et les écritures disque sont faites par un QueueListener,
+    hors des boucles de sécurité.
+    
+    Args:
+        log_file: Fichier de sortie
+        min_level: Niveau minimal
+        formatter: Formatter du fichier
+    """
+    global _queue_listener
+    
+    stop_file_listener()
+    
+    log_file.parent.mkdir(parents=True, exist_ok=True)
+    file_handler = logging.FileHandler(log_file, encoding="utf-8", delay=True)
+    file_handler.setLevel(min_level)
+    file_handler.setFormatter(formatter)
+    
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    queue_handler.setLevel(min_level)
+    logging.getLogger().addHandler(queue_handler)
+    
+    _queue_listener = logging.handlers.QueueListener(
+        log_queue, file_handler, respect_handler_level=True
+    )
+    _queue_listener.start()
+
+
+def stop_file_listener() -> None:
+    """Vide la file et arrête le thread d'écriture du fichier de log."""
+    global _queue_listener
+    
+    if _queue_listener is None:
+        return
+    
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        if isinstance(handler, logging.handlers.QueueHandler) and handler.queue is _queue_listener.queue:
+            root.removeHandler(handler)
+    
+    _queue_listener.stop()
+    for handler in _queue_listener.handlers:
+        handler.close()
+    _queue_listener = None
+
+
+atexit.register(stop_file_listener)
@@ -3,21 +3,46 @@ Configuration pytest pour RoboSafe Sentinel.
 """
 
 import asyncio
+import sys
+from types import MappingProxyType
+
 import pytest
 
+# Boucle libuv si disponible (uvloop, ou winloop sous Windows): ordonnancement
+# plus rapide pour tous les tests asyncio; sinon boucle asyncio standard.
+try:
+    if sys.platform == "win32":
+        import winloop as _fast_loop
+    else:
+        import uvloop as _fast_loop
+    asyncio.set_event_loop_policy(_fast_loop.EventLoopPolicy())
+except ImportError:
+    pass
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--runslow",
+        action="store_true",
+        default=False,
+        help="exécute aussi les tests marqués slow",
+    )
+
 
-@pytest.fixture(scope="session")
-def event_loop():
-    """Create event loop for async tests."""
-    loop = asyncio.get_event_loop_policy().new_event_loop()
-    yield loop
-    loop.close()
+def pytest_collection_modifyitems(config, items):
+    """Ignore les tests marqués slow sauf avec --runslow."""
+    if config.getoption("--runslow"):
+        return
+    skip_slow = pytest.mark.skip(reason="test lent: utiliser --runslow")
+    for item in items:
+        if "slow" in item.keywords:
+            item.add_marker(skip_slow)
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def sample_signal_values():
-    """Valeurs de signaux pour tests."""
-    return {
+    """Valeurs de signaux pour tests (lecture seule, copier avec dict() pour modifier)."""
+    return MappingProxyType({
         "fanuc_tcp_speed": 250.0,
         "fanuc_mode": "AUTO",
         "fanuc_servo_on": True,
@@ -32,13 +57,13 @@ def sample_signal_values():
         "vision_min_distance": 3000,
         "vision_confidence": 0.92,
         "robosafe_risk_score": 25.0,
-    }
+    })
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def hazardous_signal_values():
-    """Valeurs de signaux simulant une situation dangereuse."""
-    return {
+    """Valeurs de signaux simulant une situation dangereuse (lecture seule)."""
+    return MappingProxyType({
         "fanuc_tcp_speed": 500.0,
         "fanuc_mode": "AUTO",
         "fanuc_servo_on": True,
@@ -53,4 +78,4 @@ def hazardous_signal_values():
         "vision_min_distance": 600,
         "vision_confidence": 0.88,
         "robosafe_risk_score": 85.0,
-    }
+    })
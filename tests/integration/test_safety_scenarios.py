@@ -7,12 +7,17 @@ dans différents scénarios de sécurité réalistes.
 
 import pytest
 import asyncio
+import time
 from datetime import datetime
 from unittest.mock import AsyncMock, MagicMock, patch
 
 # Core
 from robosafe.core.state_machine import SafetyStateMachine, SafetyState
-from robosafe.core.signal_manager import SignalManager
+from robosafe.core.signal_manager import (
+    SignalManager,
+    SignalDefinition,
+    SignalSource,
+)
 from robosafe.core.rule_engine import RuleEngine, Rule, RulePriority, RuleAction
 
 # Agents
@@ -48,20 +53,22 @@ def rule_engine(signal_manager, state_machine):
     engine = RuleEngine(signal_manager, state_machine)
     
     # Règle distance critique
-    engine.register_rule(Rule(
+    engine.register_rule(Rule.from_threshold(
+        "scanner_min_distance", "<", 500,
+        default=10000,
         id="RS-001",
         name="Distance critique",
         priority=RulePriority.P0_CRITICAL,
-        condition=lambda ctx: ctx.get("scanner_min_distance", 10000) < 500,
         actions=[RuleAction(action_type="ESTOP", message="Distance < 500mm")],
     ))
     
     # Règle fumées critiques
-    engine.register_rule(Rule(
+    engine.register_rule(Rule.from_threshold(
+        "fumes_vlep_ratio", ">=", 1.2,
+        default=0,
         id="RS-004",
         name="Fumées critiques",
         priority=RulePriority.P0_CRITICAL,
-        condition=lambda ctx: ctx.get("fumes_vlep_ratio", 0) >= 1.2,
         actions=[RuleAction(action_type="STOP", message="Fumées > 120% VLEP")],
     ))
     
@@ -148,7 +155,9 @@ class TestScenarioIntrusionZoneDanger:
         )
         
         await analysis_agent.receive(msg)
-        await asyncio.sleep(0.15)  # Attendre le cycle d'analyse
+        analysis_agent.processed_event.clear()
+        # Attendre le cycle d'analyse
+        await asyncio.wait_for(analysis_agent.processed_event.wait(), timeout=1.0)
         
         # Vérifier que l'agent a traité le message
         assert analysis_agent.metrics["messages_processed"] >= 1
@@ -183,8 +192,9 @@ class TestScenarioIntrusionZoneDanger:
         
         perception_agent.add_sensor_callback(mock_sensor_data)
         
-        # Attendre quelques cycles
-        await asyncio.sleep(0.3)
+        # Attendre un cycle de perception
+        perception_agent.processed_event.clear()
+        await asyncio.wait_for(perception_agent.processed_event.wait(), timeout=1.0)
         
         # Cleanup
         await perception_agent.stop()
@@ -440,8 +450,6 @@ class TestScenarioPerformance:
     @pytest.mark.asyncio
     async def test_response_time_state_transition(self, state_machine):
         """Transition d'état doit être < 10ms."""
-        import time
-        
         await state_machine.transition_to(SafetyState.NOMINAL)
         
         start = time.perf_counter()
@@ -453,13 +461,24 @@ class TestScenarioPerformance:
     @pytest.mark.asyncio
     async def test_signal_update_performance(self, signal_manager):
         """Mise à jour signal doit être < 1ms."""
-        import time
+        signal_manager.register_signals([
+            SignalDefinition(
+                id=f"test_signal_{i}",
+                name=f"Test signal {i}",
+                source=SignalSource.ROBOSAFE,
+                data_type="int",
+            )
+            for i in range(100)
+        ])
         
         start = time.perf_counter()
-        for i in range(100):
-            signal_manager.update_signal(f"test_signal_{i}", i * 10)
+        updated = await signal_manager.update_signals_batch(
+            {f"test_signal_{i}": i * 10 for i in range(100)}
+        )
         elapsed = (time.perf_counter() - start) * 1000
         
+        assert updated == 100
+        assert signal_manager.get_signal_value("test_signal_99") == 990
         avg_time = elapsed / 100
         assert avg_time < 1, f"Avg update took {avg_time}ms, expected < 1ms"
 
@@ -4,7 +4,8 @@ Tests unitaires pour les agents AgenticX5.
 
 import pytest
 import asyncio
-from datetime import datetime
+from datetime import datetime, timedelta
+from types import MappingProxyType
 from unittest.mock import MagicMock, AsyncMock
 
 from robosafe.agents.base_agent import (
@@ -38,6 +39,80 @@ from robosafe.agents.orchestrator_agent import (
 )
 
 
+# Horodatage fixe partagé par les tests (pas d'appel horloge)
+FIXED_NOW = datetime(2024, 1, 1, 12, 0, 0)
+
+
+# Signaux capteur des tests d'intégration (lecture seule)
+_APPROACH_SIGNALS = MappingProxyType({
+    "scanner_min_distance": 600,
+    "fumes_vlep_ratio": 1.1,
+})
+_CRITICAL_SIGNALS = MappingProxyType({
+    "scanner_min_distance": 300,  # Très proche -> CRITICAL
+    "fanuc_tcp_speed": 500,        # En mouvement
+    "fumes_vlep_ratio": 0.3,
+})
+
+# Messages entrants des tests de traitement (chaque handler n'est appelé qu'une fois)
+_SIGNAL_BATCH_MSG = AgentMessage(
+    source="perception",
+    type="signal_batch",
+    payload={
+        "signals": [
+            {"id": "scanner_min_distance", "value": 800, "quality": "good"},
+            {"id": "fumes_vlep_ratio", "value": 0.9, "quality": "good"},
+        ],
+    },
+)
+_RISK_UPDATE_MSG = AgentMessage(
+    source="analysis",
+    type="risk_update",
+    payload={
+        "global_risk": {
+            "level": "HIGH",
+            "score": 75,
+            "confidence": 0.9,
+            "factors": ["distance: HIGH"],
+        },
+        "category_risks": {
+            "distance": {"score": 80},
+            "collision": {"score": 60},
+        },
+        "patterns": [],
+    },
+)
+
+
+class _FrozenDatetime(datetime):
+    """datetime dont now() renvoie FIXED_NOW."""
+    
+    @classmethod
+    def now(cls, tz=None):
+        return FIXED_NOW
+
+
+# IMMEDIATE l'emporte sur HIGH et NORMAL
+_URGENCY_RECOMMENDATIONS = (
+    {"id": "rec1", "action": "ALERT", "urgency": "NORMAL", "risk_score": 30, "received_at": FIXED_NOW},
+    {"id": "rec2", "action": "STOP", "urgency": "IMMEDIATE", "risk_score": 90, "received_at": FIXED_NOW},
+    {"id": "rec3", "action": "SLOW_50", "urgency": "HIGH", "risk_score": 60, "received_at": FIXED_NOW},
+)
+
+# À urgence égale, le score de risque le plus élevé
+_SCORE_RECOMMENDATIONS = (
+    {"id": "rec4", "action": "SLOW_50", "urgency": "HIGH", "risk_score": 60, "received_at": FIXED_NOW},
+    {"id": "rec5", "action": "STOP", "urgency": "HIGH", "risk_score": 80, "received_at": FIXED_NOW},
+)
+
+# À urgence et score égaux, la première arrivée
+_ARRIVAL_RECOMMENDATIONS = (
+    {"id": "rec6", "action": "ALERT", "urgency": "NORMAL", "risk_score": 40,
+     "received_at": FIXED_NOW + timedelta(seconds=1)},
+    {"id": "rec7", "action": "ALERT", "urgency": "NORMAL", "risk_score": 40, "received_at": FIXED_NOW},
+)
+
+
 class TestAgentMessage:
     """Tests pour AgentMessage."""
     
@@ -65,8 +140,8 @@ class TestAgentMessage:
         
         assert msg.is_expired is False
         
-        import time
-        time.sleep(0.15)
+        # Vieillir le message au lieu d'attendre le TTL
+        msg.timestamp -= timedelta(seconds=0.15)
         
         assert msg.is_expired is True
 
@@ -139,7 +214,6 @@ class TestPerceptionAgent:
         
         assert len(agent._sensor_callbacks) == 1
     
-    @pytest.mark.asyncio
     async def test_agent_lifecycle(self, agent):
         """Test cycle de vie."""
         await agent.start()
@@ -175,29 +249,9 @@ class TestAnalysisAgent:
         assert RiskLevel.MEDIUM < RiskLevel.HIGH
         assert RiskLevel.HIGH < RiskLevel.CRITICAL
     
-    @pytest.mark.asyncio
     async def test_handle_signal_batch(self, agent):
         """Test traitement batch de signaux."""
-        msg = AgentMessage(
-            source="perception",
-            type="signal_batch",
-            payload={
-                "signals": [
-                    {
-                        "id": "scanner_min_distance",
-                        "value": 800,
-                        "quality": "good",
-                    },
-                    {
-                        "id": "fumes_vlep_ratio",
-                        "value": 0.9,
-                        "quality": "good",
-                    },
-                ],
-            },
-        )
-        
-        await agent.handle_message(msg)
+        await agent.handle_message(_SIGNAL_BATCH_MSG)
         
         assert "scanner_min_distance" in agent._current_signals
         assert agent._current_signals["scanner_min_distance"]["value"] == 800
@@ -239,50 +293,25 @@ class TestDecisionAgent:
         assert ActionUrgency.NORMAL < ActionUrgency.HIGH
         assert ActionUrgency.HIGH < ActionUrgency.IMMEDIATE
     
-    def test_determine_action(self, agent):
+    @pytest.mark.parametrize(
+        "score,expected_action",
+        [
+            (10, ActionType.NONE),
+            (30, ActionType.ALERT),
+            (55, ActionType.SLOW_50),
+            (85, ActionType.STOP),
+            (98, ActionType.ESTOP),
+        ],
+        ids=["faible", "moyen", "eleve", "tres_eleve", "critique"],
+    )
+    def test_determine_action(self, agent, score, expected_action):
         """Test détermination action selon score."""
-        # Score faible -> NONE
-        action, urgency = agent._determine_action(10)
-        assert action == ActionType.NONE
-        
-        # Score moyen -> ALERT
-        action, urgency = agent._determine_action(30)
-        assert action == ActionType.ALERT
-        
-        # Score élevé -> SLOW_50
-        action, urgency = agent._determine_action(55)
-        assert action == ActionType.SLOW_50
-        
-        # Score très élevé -> STOP
-        action, urgency = agent._determine_action(85)
-        assert action == ActionType.STOP
-        
-        # Score critique -> ESTOP
-        action, urgency = agent._determine_action(98)
-        assert action == ActionType.ESTOP
+        action, urgency = agent._determine_action(score)
+        assert action == expected_action
     
-    @pytest.mark.asyncio
     async def test_handle_risk_update(self, agent):
         """Test traitement mise à jour risque."""
-        msg = AgentMessage(
-            source="analysis",
-            type="risk_update",
-            payload={
-                "global_risk": {
-                    "level": "HIGH",
-                    "score": 75,
-                    "confidence": 0.9,
-                    "factors": ["distance: HIGH"],
-                },
-                "category_risks": {
-                    "distance": {"score": 80},
-                    "collision": {"score": 60},
-                },
-                "patterns": [],
-            },
-        )
-        
-        await agent.handle_message(msg)
+        await agent.handle_message(_RISK_UPDATE_MSG)
         
         assert agent._global_risk["score"] == 75
         assert "distance" in agent._current_risks
@@ -306,7 +335,6 @@ class TestOrchestratorAgent:
         assert ExecutionStatus.SUCCESS.value == 3
         assert ExecutionStatus.FAILED.value == 4
     
-    @pytest.mark.asyncio
     async def test_start_stop(self, agent):
         """Test démarrage/arrêt."""
         await agent.start()
@@ -324,8 +352,11 @@ class TestOrchestratorAgent:
         
         assert "CUSTOM" in agent._action_executors
     
-    def test_audit_log(self, agent):
+    def test_audit_log(self, agent, monkeypatch):
         """Test log d'audit."""
+        monkeypatch.setattr(
+            "robosafe.agents.orchestrator_agent.datetime", _FrozenDatetime
+        )
         agent._log_audit("test_event", "Test message", {"key": "value"})
         
         log = agent.get_audit_log(limit=1)
@@ -333,44 +364,30 @@ class TestOrchestratorAgent:
         assert len(log) == 1
         assert log[0]["event_type"] == "test_event"
         assert log[0]["message"] == "Test message"
+        assert log[0]["timestamp"] == FIXED_NOW.isoformat()
     
-    def test_arbitrate_recommendations(self, agent):
+    @pytest.mark.parametrize(
+        "recommendations,expected_id",
+        [
+            (_URGENCY_RECOMMENDATIONS, "rec2"),
+            (_SCORE_RECOMMENDATIONS, "rec5"),
+            (_ARRIVAL_RECOMMENDATIONS, "rec7"),
+        ],
+        ids=["urgency", "risk_score", "arrival"],
+    )
+    def test_arbitrate_recommendations(self, agent, recommendations, expected_id):
         """Test arbitrage recommandations."""
-        agent._pending_recommendations = [
-            {
-                "id": "rec1",
-                "action": "ALERT",
-                "urgency": "NORMAL",
-                "risk_score": 30,
-                "received_at": datetime.now(),
-            },
-            {
-                "id": "rec2",
-                "action": "STOP",
-                "urgency": "IMMEDIATE",
-                "risk_score": 90,
-                "received_at": datetime.now(),
-            },
-            {
-                "id": "rec3",
-                "action": "SLOW_50",
-                "urgency": "HIGH",
-                "risk_score": 60,
-                "received_at": datetime.now(),
-            },
-        ]
+        # Copie: l'arbitrage vide la file
+        agent._pending_recommendations = list(recommendations)
         
         selected = agent._arbitrate_recommendations()
         
-        # IMMEDIATE devrait être sélectionné
-        assert selected["id"] == "rec2"
-        assert selected["urgency"] == "IMMEDIATE"
+        assert selected["id"] == expected_id
 
 
 class TestAgentIntegration:
     """Tests d'intégration entre agents."""
     
-    @pytest.mark.asyncio
     async def test_perception_to_analysis(self):
         """Test communication Perception -> Analysis."""
         perception = PerceptionAgent()
@@ -379,11 +396,7 @@ class TestAgentIntegration:
         messages_sent = []
         
         # Ajouter un callback capteur qui retourne des signaux
-        test_signals = {
-            "scanner_min_distance": 600,
-            "fumes_vlep_ratio": 1.1,
-        }
-        perception.add_sensor_callback(lambda: test_signals)
+        perception.add_sensor_callback(lambda: _APPROACH_SIGNALS)
         
         # Capturer les messages envoyés par perception
         def capture_message(msg):
@@ -398,7 +411,6 @@ class TestAgentIntegration:
         assert len(messages_sent) > 0, "Perception should send signal_batch message"
         assert messages_sent[0].type == "signal_batch"
     
-    @pytest.mark.asyncio
     async def test_full_pipeline(self):
         """Test pipeline complet."""
         # Créer les agents
@@ -415,12 +427,7 @@ class TestAgentIntegration:
         }
         
         # Ajouter un callback capteur avec scénario critique
-        test_signals = {
-            "scanner_min_distance": 300,  # Très proche -> CRITICAL
-            "fanuc_tcp_speed": 500,        # En mouvement
-            "fumes_vlep_ratio": 0.3,
-        }
-        perception.add_sensor_callback(lambda: test_signals)
+        perception.add_sensor_callback(lambda: _CRITICAL_SIGNALS)
         
         # Router les messages de manière synchrone pour les tests
         def route_from_perception(msg):
@@ -2,27 +2,98 @@
 Tests unitaires pour l'API RoboSafe.
 """
 
+import asyncio
 import pytest
 from datetime import datetime
-from unittest.mock import AsyncMock, MagicMock, patch
+from types import SimpleNamespace
 
-from fastapi.testclient import TestClient
+import httpx
 
 from robosafe.api.server import app, init_api
 from robosafe.api.websocket_manager import WebSocketManager
 from robosafe.api.metrics import MetricsCollector, SimpleMetrics
 
 
+class FakeWS:
+    """WebSocket factice: méthodes async simples, un compteur au lieu d'un historique d'appels."""
+    
+    def __init__(self):
+        self.send_count = 0
+        self.last_message = None
+        self.accept_count = 0
+        self.closed = False
+    
+    async def accept(self):
+        self.accept_count += 1
+    
+    async def send_json(self, message):
+        self.send_count += 1
+        self.last_message = message
+    
+    async def close(self):
+        self.closed = True
+
+
+@pytest.fixture(scope="module")
+async def client():
+    """Client HTTP asynchrone partagé par le module (transport ASGI direct)."""
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as ac:
+        yield ac
+
+
+@pytest.fixture(autouse=True)
+def reset_api():
+    """Remet les gestionnaires de l'API à None avant chaque test."""
+    init_api(None, None, None)
+
+
+async def _request_estop(**kwargs):
+    return True
+
+
+@pytest.fixture
+def api_mocks():
+    """Injecte des gestionnaires factices (signal_manager, state_machine, rule_engine)."""
+    signal_manager = SimpleNamespace(get_stats=lambda: {
+        "total_signals": 20,
+        "valid_signals": 18,
+        "invalid_signals": 2,
+    })
+    state_machine = SimpleNamespace(
+        get_status=lambda: {
+            "current_state": "NORMAL",
+            "state_code": 1,
+            "max_speed_percent": 100,
+            "allows_production": True,
+            "state_duration_seconds": 60.0,
+        },
+        request_estop=_request_estop,
+    )
+    rule = SimpleNamespace(
+        id="RS-001",
+        name="Test Rule",
+        priority=SimpleNamespace(name="P0_CRITICAL"),
+        enabled=True,
+        _trigger_count=5,
+        _last_triggered=None,
+    )
+    rule_engine = SimpleNamespace(
+        get_stats=lambda: {"total_rules": 15, "trigger_count": 5},
+        _rules={"RS-001": rule},
+    )
+    
+    init_api(signal_manager, state_machine, rule_engine)
+    yield signal_manager, state_machine, rule_engine
+    init_api(None, None, None)
+
+
 class TestHealthEndpoint:
     """Tests pour /health."""
     
-    @pytest.fixture
-    def client(self):
-        return TestClient(app)
-    
-    def test_health_check(self, client):
+    async def test_health_check(self, client):
         """Test health check basique."""
-        response = client.get("/health")
+        response = await client.get("/health")
         
         assert response.status_code == 200
         data = response.json()
@@ -34,49 +105,18 @@ class TestHealthEndpoint:
 class TestStatusEndpoint:
     """Tests pour /api/v1/status."""
     
-    @pytest.fixture
-    def client(self):
-        return TestClient(app)
-    
-    def test_status_without_managers(self, client):
+    async def test_status_without_managers(self, client):
         """Test status sans gestionnaires initialisés."""
-        response = client.get("/api/v1/status")
+        response = await client.get("/api/v1/status")
         
         assert response.status_code == 200
         data = response.json()
         assert "safety_state" in data
         assert "version" in data
     
-    def test_status_with_mocked_managers(self, client):
+    async def test_status_with_mocked_managers(self, client, api_mocks):
         """Test status avec gestionnaires mockés."""
-        # Mock state machine
-        mock_state_machine = MagicMock()
-        mock_state_machine.get_status.return_value = {
-            "current_state": "NORMAL",
-            "state_code": 1,
-            "max_speed_percent": 100,
-            "allows_production": True,
-            "state_duration_seconds": 60.0,
-        }
-        
-        # Mock signal manager
-        mock_signal_manager = MagicMock()
-        mock_signal_manager.get_stats.return_value = {
-            "total_signals": 20,
-            "valid_signals": 18,
-            "invalid_signals": 2,
-        }
-        
-        # Mock rule engine
-        mock_rule_engine = MagicMock()
-        mock_rule_engine.get_stats.return_value = {
-            "total_rules": 15,
-            "trigger_count": 5,
-        }
-        
-        init_api(mock_signal_manager, mock_state_machine, mock_rule_engine)
-        
-        response = client.get("/api/v1/status")
+        response = await client.get("/api/v1/status")
         
         assert response.status_code == 200
         data = response.json()
@@ -88,17 +128,9 @@ class TestStatusEndpoint:
 class TestSignalsEndpoint:
     """Tests pour /api/v1/signals."""
     
-    @pytest.fixture
-    def client(self):
-        return TestClient(app)
-    
-    def test_signals_without_manager(self, client):
+    async def test_signals_without_manager(self, client):
         """Test signals sans gestionnaire."""
-        # Reset le signal manager
-        import robosafe.api.server as server
-        server._signal_manager = None
-        
-        response = client.get("/api/v1/signals")
+        response = await client.get("/api/v1/signals")
         
         assert response.status_code == 503
 
@@ -106,19 +138,9 @@ class TestSignalsEndpoint:
 class TestCommandEndpoint:
     """Tests pour /api/v1/command."""
     
-    @pytest.fixture
-    def client(self):
-        return TestClient(app)
-    
-    def test_command_estop(self, client):
+    async def test_command_estop(self, client, api_mocks):
         """Test commande E-STOP."""
-        # Mock state machine
-        mock_state_machine = MagicMock()
-        mock_state_machine.request_estop = AsyncMock(return_value=True)
-        
-        init_api(None, mock_state_machine, None)
-        
-        response = client.post("/api/v1/command", json={
+        response = await client.post("/api/v1/command", json={
             "command": "ESTOP",
             "reason": "Test emergency",
             "operator_id": "test_user",
@@ -129,12 +151,9 @@ class TestCommandEndpoint:
         assert data["success"] is True
         assert data["command"] == "ESTOP"
     
-    def test_command_invalid(self, client):
+    async def test_command_invalid(self, client, api_mocks):
         """Test commande invalide."""
-        mock_state_machine = MagicMock()
-        init_api(None, mock_state_machine, None)
-        
-        response = client.post("/api/v1/command", json={
+        response = await client.post("/api/v1/command", json={
             "command": "INVALID_COMMAND",
         })
         
@@ -144,27 +163,9 @@ class TestCommandEndpoint:
 class TestRulesEndpoint:
     """Tests pour /api/v1/rules."""
     
-    @pytest.fixture
-    def client(self):
-        return TestClient(app)
-    
-    def test_rules_list(self, client):
+    async def test_rules_list(self, client, api_mocks):
         """Test liste des règles."""
-        # Mock rule engine
-        mock_rule_engine = MagicMock()
-        mock_rule = MagicMock()
-        mock_rule.id = "RS-001"
-        mock_rule.name = "Test Rule"
-        mock_rule.priority.name = "P0_CRITICAL"
-        mock_rule.enabled = True
-        mock_rule._trigger_count = 5
-        mock_rule._last_triggered = None
-        
-        mock_rule_engine._rules = {"RS-001": mock_rule}
-        
-        init_api(None, None, mock_rule_engine)
-        
-        response = client.get("/api/v1/rules")
+        response = await client.get("/api/v1/rules")
         
         assert response.status_code == 200
         data = response.json()
@@ -184,84 +185,65 @@ class TestWebSocketManager:
         assert manager.client_count == 0
         assert manager.stats["current_connections"] == 0
     
-    @pytest.mark.asyncio
     async def test_connect_disconnect(self, manager):
         """Test connexion/déconnexion."""
-        # Mock WebSocket
-        mock_ws = AsyncMock()
-        mock_ws.accept = AsyncMock()
-        mock_ws.send_json = AsyncMock()
+        ws = FakeWS()
         
-        await manager.connect(mock_ws, client_id="test_client")
+        await manager.connect(ws, client_id="test_client")
         
         assert manager.client_count == 1
-        mock_ws.accept.assert_called_once()
+        assert ws.accept_count == 1
         
-        manager.disconnect(mock_ws)
+        manager.disconnect(ws)
         
         assert manager.client_count == 0
     
-    @pytest.mark.asyncio
     async def test_broadcast(self, manager):
         """Test broadcast."""
-        # Mock WebSockets
-        mock_ws1 = AsyncMock()
-        mock_ws1.accept = AsyncMock()
-        mock_ws1.send_json = AsyncMock()
-        
-        mock_ws2 = AsyncMock()
-        mock_ws2.accept = AsyncMock()
-        mock_ws2.send_json = AsyncMock()
+        ws1, ws2 = FakeWS(), FakeWS()
         
-        await manager.connect(mock_ws1)
-        await manager.connect(mock_ws2)
+        await asyncio.gather(manager.connect(ws1), manager.connect(ws2))
         
         message = {"type": "test", "data": "hello"}
         sent_count = await manager.broadcast(message)
         
         assert sent_count == 2
-        mock_ws1.send_json.assert_called()
-        mock_ws2.send_json.assert_called()
+        # Bienvenue + broadcast
+        assert ws1.send_count == ws2.send_count == 2
+        assert ws1.last_message == ws2.last_message == message
     
-    @pytest.mark.asyncio
     async def test_rooms(self, manager):
         """Test rooms."""
-        mock_ws = AsyncMock()
-        mock_ws.accept = AsyncMock()
-        mock_ws.send_json = AsyncMock()
+        ws = FakeWS()
         
-        await manager.connect(mock_ws, rooms=["alerts", "signals"])
+        await manager.connect(ws, rooms=["alerts", "signals"])
         
         assert manager.get_room_clients("alerts") == 1
         assert manager.get_room_clients("signals") == 1
         assert manager.get_room_clients("other") == 0
     
-    @pytest.mark.asyncio
     async def test_disconnect_all(self, manager):
         """Test déconnexion de tous les clients."""
-        mock_ws1 = AsyncMock()
-        mock_ws1.accept = AsyncMock()
-        mock_ws1.send_json = AsyncMock()
-        mock_ws1.close = AsyncMock()
+        ws1, ws2 = FakeWS(), FakeWS()
         
-        mock_ws2 = AsyncMock()
-        mock_ws2.accept = AsyncMock()
-        mock_ws2.send_json = AsyncMock()
-        mock_ws2.close = AsyncMock()
-        
-        await manager.connect(mock_ws1)
-        await manager.connect(mock_ws2)
+        await asyncio.gather(manager.connect(ws1), manager.connect(ws2))
         
         assert manager.client_count == 2
         
         await manager.disconnect_all()
         
         assert manager.client_count == 0
+        assert ws1.closed and ws2.closed
 
 
 class TestMetricsCollector:
     """Tests pour le collecteur de métriques."""
     
+    @pytest.fixture
+    def no_prometheus(self, monkeypatch):
+        """Simule l'absence de prometheus_client."""
+        monkeypatch.setattr("robosafe.api.metrics.PROMETHEUS_AVAILABLE", False)
+    
     def test_simple_metrics(self):
         """Test métriques simples (sans prometheus)."""
         metrics = SimpleMetrics()
@@ -281,18 +263,17 @@ class TestMetricsCollector:
         
         assert "robosafe_safety_state 1" in output
     
-    def test_metrics_collector_disabled(self):
+    def test_metrics_collector_disabled(self, no_prometheus):
         """Test collecteur avec prometheus désactivé."""
-        with patch("robosafe.api.metrics.PROMETHEUS_AVAILABLE", False):
-            collector = MetricsCollector()
-            
-            # Les méthodes ne doivent pas lever d'exception
-            collector.update_safety_state(1, 100)
-            collector.update_signals(10, 8, 2)
-            collector.update_distance(1500)
-            
-            output = collector.export()
-            assert "not available" in output.lower()
+        collector = MetricsCollector()
+        
+        # Les méthodes ne doivent pas lever d'exception
+        collector.update_safety_state(1, 100)
+        collector.update_signals(10, 8, 2)
+        collector.update_distance(1500)
+        
+        output = collector.export()
+        assert "not available" in output.lower()
     
     def test_update_from_state(self):
         """Test mise à jour depuis état."""
@@ -318,13 +299,9 @@ class TestMetricsCollector:
 class TestAPIIntegration:
     """Tests d'intégration API."""
     
-    @pytest.fixture
-    def client(self):
-        return TestClient(app)
-    
-    def test_cors_headers(self, client):
+    async def test_cors_headers(self, client):
         """Test headers CORS."""
-        response = client.options(
+        response = await client.options(
             "/api/v1/status",
             headers={"Origin": "http://localhost:3000"},
         )
@@ -332,23 +309,23 @@ class TestAPIIntegration:
         # CORS devrait autoriser l'origine
         assert response.headers.get("access-control-allow-origin")
     
-    def test_metrics_endpoint(self, client):
+    async def test_metrics_endpoint(self, client):
         """Test endpoint métriques."""
-        response = client.get("/metrics")
+        response = await client.get("/metrics")
         
         assert response.status_code == 200
         # Content-Type devrait être text/plain
         assert "text" in response.headers.get("content-type", "")
     
-    def test_api_documentation(self, client):
+    async def test_api_documentation(self, client):
         """Test accès documentation OpenAPI."""
-        response = client.get("/docs")
+        response = await client.get("/docs")
         
         assert response.status_code == 200
     
-    def test_openapi_schema(self, client):
+    async def test_openapi_schema(self, client):
         """Test schéma OpenAPI."""
-        response = client.get("/openapi.json")
+        response = await client.get("/openapi.json")
         
         assert response.status_code == 200
         data = response.json()
@@ -2,6 +2,7 @@
 Tests unitaires pour les drivers capteurs.
 """
 
+import asyncio
 import pytest
 from datetime import datetime
 
@@ -30,41 +31,86 @@ from robosafe.sensors.fumes_sensor import (
     FumesMeasurement,
     FumesAlertLevel,
 )
+from robosafe.sensors.vision_ai import VisionSimulator
+
+
+@pytest.fixture(scope="module")
+async def s7_simulator():
+    """Simulateur S7 connecté, partagé par le module."""
+    simulator = SiemensS7Simulator()
+    await simulator.connect()
+    yield simulator
+    await simulator.disconnect()
+
+
+@pytest.fixture(scope="module")
+async def fanuc_simulator():
+    """Simulateur Fanuc connecté, partagé par le module."""
+    simulator = FanucSimulator()
+    await simulator.connect()
+    yield simulator
+    await simulator.disconnect()
+
+
+@pytest.fixture(scope="module")
+def scanner_config():
+    return ScannerConfig(
+        id="scanner_test",
+        zone_protective_mm=500,
+        zone_warning_mm=1200,
+    )
+
+
+@pytest.fixture(scope="module")
+def fumes_config():
+    return FumesConfig(
+        vlep_mgm3=5.0,
+        threshold_yellow=0.5,
+        threshold_orange=0.8,
+        threshold_red=1.0,
+        threshold_critical=1.2,
+    )
+
+
+@pytest.fixture(scope="module")
+async def fumes_simulator(fumes_config):
+    """Simulateur fumées connecté, partagé par le module."""
+    simulator = FumesSensorSimulator(fumes_config)
+    await simulator.connect()
+    yield simulator
+    await simulator.disconnect()
+
+
+@pytest.mark.parametrize(
+    "factory",
+    [SiemensS7Simulator, FanucSimulator, SICKScannerSimulator, FumesSensorSimulator, VisionSimulator],
+)
+async def test_simulator_connect(factory):
+    """Test connexion/déconnexion de chaque simulateur."""
+    simulator = factory()
+    assert await simulator.connect() is True
+    assert simulator.is_connected is True
+    await simulator.disconnect()
 
 
 class TestSiemensS7Simulator:
     """Tests pour le simulateur Siemens S7."""
     
-    @pytest.fixture
-    def simulator(self):
-        return SiemensS7Simulator()
-    
-    @pytest.mark.asyncio
-    async def test_connect(self, simulator):
-        """Test connexion simulateur."""
-        result = await simulator.connect()
-        assert result is True
-        assert simulator.is_connected is True
-    
-    @pytest.mark.asyncio
-    async def test_disconnect(self, simulator):
+    async def test_disconnect(self):
         """Test déconnexion."""
+        simulator = SiemensS7Simulator()
         await simulator.connect()
         await simulator.disconnect()
         assert simulator.is_connected is False
     
-    @pytest.mark.asyncio
-    async def test_send_command(self, simulator):
+    async def test_send_command(self, s7_simulator):
         """Test envoi commande."""
-        await simulator.connect()
-        result = await simulator.send_command(SafetyCommand.SLOW_50, 50)
+        result = await s7_simulator.send_command(SafetyCommand.SLOW_50, 50)
         assert result is True
     
-    @pytest.mark.asyncio
-    async def test_request_stop(self, simulator):
+    async def test_request_stop(self, s7_simulator):
         """Test demande arrêt."""
-        await simulator.connect()
-        result = await simulator.request_stop()
+        result = await s7_simulator.request_stop()
         assert result is True
     
     def test_safety_status_to_dict(self):
@@ -98,22 +144,9 @@ class TestSiemensS7Simulator:
 class TestFanucSimulator:
     """Tests pour le simulateur Fanuc."""
     
-    @pytest.fixture
-    def simulator(self):
-        return FanucSimulator()
-    
-    @pytest.mark.asyncio
-    async def test_connect(self, simulator):
-        """Test connexion."""
-        result = await simulator.connect()
-        assert result is True
-        assert simulator.is_connected is True
-    
-    @pytest.mark.asyncio
-    async def test_set_speed_override(self, simulator):
+    async def test_set_speed_override(self, fanuc_simulator):
         """Test modification override vitesse."""
-        await simulator.connect()
-        result = await simulator.set_speed_override(50)
+        result = await fanuc_simulator.set_speed_override(50)
         assert result is True
     
     def test_tcp_position_distance(self):
@@ -127,6 +160,10 @@ class TestFanucSimulator:
         pos3 = FanucTCPPosition(x=300, y=400, z=0)
         distance = pos1.distance_to(pos3)
         assert distance == 500.0  # 3-4-5 triangle
+        
+        # Pas de dépassement: dx² + dy² vaudrait inf
+        far = FanucTCPPosition(x=1e200, y=1e200, z=0)
+        assert pos1.distance_to(far) == pytest.approx(1e200 * 2 ** 0.5)
     
     def test_fanuc_status_to_dict(self):
         """Test conversion FanucStatus en dict."""
@@ -146,24 +183,6 @@ class TestFanucSimulator:
 class TestSICKScannerSimulator:
     """Tests pour le simulateur scanner SICK."""
     
-    @pytest.fixture
-    def config(self):
-        return ScannerConfig(
-            id="scanner_test",
-            zone_protective_mm=500,
-            zone_warning_mm=1200,
-        )
-    
-    @pytest.fixture
-    def simulator(self, config):
-        return SICKScannerSimulator(config)
-    
-    @pytest.mark.asyncio
-    async def test_connect(self, simulator):
-        """Test connexion."""
-        result = await simulator.connect()
-        assert result is True
-    
     def test_zone_requires_stop(self):
         """Test zone requiert arrêt."""
         assert SICKZone.PROTECTIVE.requires_stop is True
@@ -176,7 +195,7 @@ class TestSICKScannerSimulator:
         assert SICKZone.PROTECTIVE.requires_slow is False
         assert SICKZone.CLEAR.requires_slow is False
     
-    def test_measurement_to_dict(self, config):
+    def test_measurement_to_dict(self, scanner_config):
         """Test conversion mesure en dict."""
         measurement = ScannerMeasurement(
             scanner_id="scanner_1",
@@ -194,27 +213,7 @@ class TestSICKScannerSimulator:
 class TestFumesSensorSimulator:
     """Tests pour le simulateur capteur fumées."""
     
-    @pytest.fixture
-    def config(self):
-        return FumesConfig(
-            vlep_mgm3=5.0,
-            threshold_yellow=0.5,
-            threshold_orange=0.8,
-            threshold_red=1.0,
-            threshold_critical=1.2,
-        )
-    
-    @pytest.fixture
-    def simulator(self, config):
-        return FumesSensorSimulator(config)
-    
-    @pytest.mark.asyncio
-    async def test_connect(self, simulator):
-        """Test connexion."""
-        result = await simulator.connect()
-        assert result is True
-    
-    def test_alert_levels(self, config):
+    def test_alert_levels(self, fumes_config):
         """Test niveaux d'alerte."""
         # < 50% = GREEN
         m = FumesMeasurement(vlep_ratio=0.3, alert_level=FumesAlertLevel.GREEN)
@@ -257,56 +256,34 @@ class TestFumesSensorSimulator:
         assert d["fumes_exposure_minutes"] == 30.5
         assert d["fumes_requires_alert"] is True
     
-    @pytest.mark.asyncio
-    async def test_welding_active_simulation(self, simulator):
+    async def test_welding_active_simulation(self, fumes_simulator):
         """Test simulation soudage actif."""
-        await simulator.connect()
-        
-        simulator.set_welding_active(True)
+        fumes_simulator.set_welding_active(True)
         # La concentration devrait être plus élevée
         # (testé via la boucle de simulation)
         
-        simulator.set_welding_active(False)
+        fumes_simulator.set_welding_active(False)
         # La concentration devrait diminuer
-
-
-class TestIntegration:
-    """Tests d'intégration basiques."""
     
-    @pytest.mark.asyncio
-    async def test_all_simulators_connect(self):
-        """Test que tous les simulateurs peuvent se connecter."""
-        s7 = SiemensS7Simulator()
-        fanuc = FanucSimulator()
-        scanner = SICKScannerSimulator()
-        fumes = FumesSensorSimulator()
-        
-        assert await s7.connect()
-        assert await fanuc.connect()
-        assert await scanner.connect()
-        assert await fumes.connect()
-        
-        await s7.disconnect()
-        await fanuc.disconnect()
-        await scanner.disconnect()
-        await fumes.disconnect()
-    
-    @pytest.mark.asyncio
-    async def test_callbacks_registered(self):
+    async def test_callbacks_registered(self, fumes_simulator):
         """Test enregistrement callbacks."""
         received = []
+        enough = asyncio.Event()
         
-        simulator = FumesSensorSimulator()
-        simulator.on_measurement(lambda m: received.append(m))
-        
-        await simulator.connect()
-        await simulator.start_cyclic_read(100)
+        def on_measurement(m):
+            received.append(m)
+            if len(received) >= 2:
+                enough.set()
         
-        # Attendre quelques mesures
-        import asyncio
-        await asyncio.sleep(0.3)
-        
-        await simulator.stop_cyclic_read()
-        await simulator.disconnect()
+        fumes_simulator.on_measurement(on_measurement)
+        try:
+            await fumes_simulator.start_cyclic_read(100)
+            # Attendre quelques mesures
+            await asyncio.wait_for(enough.wait(), timeout=2.0)
+        finally:
+            await fumes_simulator.stop_cyclic_read()
+            # Simulateur partagé: ne pas laisser le callback aux tests suivants
+            fumes_simulator._callbacks_measurement.remove(on_measurement)
         
         assert len(received) >= 2
+        assert fumes_simulator.is_connected is True
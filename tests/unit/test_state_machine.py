@@ -12,33 +12,65 @@ from robosafe.core.state_machine import (
 )
 
 
+# (état, code protocole, vitesse max %, production autorisée)
+STATE_TABLE = [
+    (SafetyState.INIT, 0x00, 0, False),
+    (SafetyState.NORMAL, 0x01, 100, True),
+    (SafetyState.WARNING, 0x02, 100, True),
+    (SafetyState.SLOW_50, 0x03, 50, True),
+    (SafetyState.SLOW_25, 0x04, 25, True),
+    (SafetyState.STOP, 0x10, 0, False),
+    (SafetyState.ESTOP, 0xFF, 0, False),
+    (SafetyState.RECOVERY, 0x20, 10, False),
+    (SafetyState.FALLBACK, 0xF0, 50, False),
+]
+
+
+@pytest.fixture(scope="module")
+def shared_state_machine():
+    """Machine d'états partagée par les tests du module."""
+    return SafetyStateMachine(initial_state=SafetyState.INIT)
+
+
 class TestSafetyState:
     """Tests pour l'enum SafetyState."""
     
-    def test_state_codes(self):
-        """Vérifie les codes d'état."""
-        assert SafetyState.NORMAL.code == 0x01
-        assert SafetyState.ESTOP.code == 0xFF
-        assert SafetyState.STOP.code == 0x10
-    
-    def test_max_speed_percent(self):
-        """Vérifie les vitesses maximales."""
-        assert SafetyState.NORMAL.max_speed_percent == 100
-        assert SafetyState.SLOW_50.max_speed_percent == 50
-        assert SafetyState.SLOW_25.max_speed_percent == 25
-        assert SafetyState.STOP.max_speed_percent == 0
-        assert SafetyState.ESTOP.max_speed_percent == 0
-        assert SafetyState.RECOVERY.max_speed_percent == 10
-    
-    def test_allows_production(self):
-        """Vérifie quels états permettent la production."""
-        assert SafetyState.NORMAL.allows_production is True
-        assert SafetyState.WARNING.allows_production is True
-        assert SafetyState.SLOW_50.allows_production is True
-        assert SafetyState.SLOW_25.allows_production is True
-        assert SafetyState.STOP.allows_production is False
-        assert SafetyState.ESTOP.allows_production is False
-        assert SafetyState.RECOVERY.allows_production is False
+    @pytest.mark.parametrize(
+        "state,code,max_speed,allows_production",
+        STATE_TABLE,
+        ids=[row[0].name for row in STATE_TABLE],
+    )
+    def test_state_properties(self, state, code, max_speed, allows_production):
+        """Vérifie code, vitesse maximale et autorisation de production."""
+        assert state.code == code
+        assert state.max_speed_percent == max_speed
+        assert state.allows_production is allows_production
+    
+    def test_table_covers_all_states(self):
+        """Vérifie que la table couvre tous les états."""
+        assert {row[0] for row in STATE_TABLE} == set(SafetyState)
+
+
+# (état courant, état cible, transition autorisée)
+TRANSITIONS_TABLE = [
+    (SafetyState.INIT, SafetyState.NORMAL, True),
+    (SafetyState.INIT, SafetyState.RECOVERY, False),
+    (SafetyState.NORMAL, SafetyState.NORMAL, True),
+    (SafetyState.NORMAL, SafetyState.SLOW_50, True),
+    (SafetyState.NORMAL, SafetyState.SLOW_25, True),
+    (SafetyState.NORMAL, SafetyState.STOP, True),
+    (SafetyState.NORMAL, SafetyState.ESTOP, True),
+    (SafetyState.NORMAL, SafetyState.FALLBACK, True),
+    (SafetyState.NORMAL, SafetyState.RECOVERY, False),
+    (SafetyState.SLOW_50, SafetyState.NORMAL, True),
+    (SafetyState.STOP, SafetyState.NORMAL, False),
+    (SafetyState.STOP, SafetyState.RECOVERY, True),
+    (SafetyState.ESTOP, SafetyState.NORMAL, False),
+    (SafetyState.ESTOP, SafetyState.STOP, False),
+    (SafetyState.ESTOP, SafetyState.RECOVERY, True),
+    (SafetyState.RECOVERY, SafetyState.NORMAL, True),
+    (SafetyState.FALLBACK, SafetyState.RECOVERY, True),
+]
 
 
 class TestStateTransition:
@@ -57,7 +89,11 @@ class TestStateTransition:
         assert transition.to_state == SafetyState.STOP
         assert transition.trigger == "intrusion_detected"
         assert transition.rule_id == "RS-010"
+        assert isinstance(transition.timestamp_ns, int)
         assert isinstance(transition.timestamp, datetime)
+        assert transition.timestamp.timestamp() == pytest.approx(
+            transition.timestamp_ns / 1e9
+        )
     
     def test_to_dict(self):
         """Vérifie la conversion en dictionnaire."""
@@ -78,50 +114,40 @@ class TestStateTransition:
 class TestSafetyStateMachine:
     """Tests pour SafetyStateMachine."""
     
+    def test_transition_rules(self):
+        """Vérifie la table des transitions autorisées/refusées."""
+        for from_state, to_state, expected in TRANSITIONS_TABLE:
+            assert SafetyStateMachine._validate_transition(
+                from_state, to_state
+            ) is expected, (from_state.name, to_state.name)
+    
+    def test_estop_reachable_from_any_state(self):
+        """Vérifie que E-STOP est accessible depuis tout état."""
+        assert all(
+            SafetyStateMachine._validate_transition(state, SafetyState.ESTOP)
+            for state in SafetyState
+        )
+    
+    def test_estop_exits_only_to_recovery(self):
+        """Vérifie que E-STOP ne sort que vers RECOVERY (reset manuel)."""
+        targets = {
+            state for state in SafetyState
+            if state is not SafetyState.ESTOP
+            and SafetyStateMachine._validate_transition(SafetyState.ESTOP, state)
+        }
+        assert targets == {SafetyState.RECOVERY}
+    
     @pytest.fixture
-    def state_machine(self):
-        """Crée une machine d'états pour les tests."""
-        return SafetyStateMachine(initial_state=SafetyState.INIT)
+    def state_machine(self, shared_state_machine):
+        """Machine d'états remise à INIT avant chaque test."""
+        shared_state_machine.reset()
+        return shared_state_machine
     
     def test_initial_state(self, state_machine):
         """Vérifie l'état initial."""
         assert state_machine.current_state == SafetyState.INIT
         assert state_machine.previous_state is None
     
-    @pytest.mark.asyncio
-    async def test_valid_transition(self, state_machine):
-        """Vérifie une transition valide."""
-        result = await state_machine.transition_to(
-            SafetyState.NORMAL,
-            trigger="init_complete",
-        )
-        
-        assert result is True
-        assert state_machine.current_state == SafetyState.NORMAL
-        assert state_machine.previous_state == SafetyState.INIT
-    
-    @pytest.mark.asyncio
-    async def test_invalid_transition(self, state_machine):
-        """Vérifie qu'une transition invalide est rejetée."""
-        # De INIT, on ne peut pas aller directement à RECOVERY
-        result = await state_machine.transition_to(
-            SafetyState.RECOVERY,
-            trigger="invalid",
-        )
-        
-        assert result is False
-        assert state_machine.current_state == SafetyState.INIT
-    
-    @pytest.mark.asyncio
-    async def test_estop_always_accepted(self, state_machine):
-        """Vérifie que E-STOP est toujours accepté."""
-        await state_machine.transition_to(SafetyState.NORMAL, trigger="init")
-        
-        result = await state_machine.request_estop(trigger="emergency")
-        
-        assert result is True
-        assert state_machine.current_state == SafetyState.ESTOP
-    
     @pytest.mark.asyncio
     async def test_transition_history(self, state_machine):
         """Vérifie l'historique des transitions."""
@@ -148,16 +174,6 @@ class TestSafetyStateMachine:
         assert result is True
         assert len(state_machine.history) == initial_history_len
     
-    @pytest.mark.asyncio
-    async def test_request_stop(self, state_machine):
-        """Vérifie la demande d'arrêt."""
-        await state_machine.transition_to(SafetyState.NORMAL, trigger="init")
-        
-        result = await state_machine.request_stop(trigger="intrusion")
-        
-        assert result is True
-        assert state_machine.current_state == SafetyState.STOP
-    
     @pytest.mark.asyncio
     async def test_request_slow(self, state_machine):
         """Vérifie la demande de ralentissement."""
@@ -237,3 +253,15 @@ class TestSafetyStateMachine:
         
         assert len(transitions_received) == 1
         assert transitions_received[0].to_state == SafetyState.NORMAL
+    
+    @pytest.mark.asyncio
+    async def test_reset(self, state_machine):
+        """Vérifie la réinitialisation (état, précédent, historique)."""
+        await state_machine.transition_to(SafetyState.NORMAL, trigger="init")
+        await state_machine.request_estop(trigger="emergency")
+        
+        state_machine.reset()
+        
+        assert state_machine.current_state == SafetyState.INIT
+        assert state_machine.previous_state is None
+        assert state_machine.history == []
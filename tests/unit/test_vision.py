@@ -2,19 +2,41 @@
 Tests unitaires pour le driver Vision IA.
 """
 
+import asyncio
+import threading
+import numpy as np
 import pytest
 from datetime import datetime
 
 from robosafe.sensors.vision_ai import (
+    VisionAIDriver,
     VisionSimulator,
     VisionConfig,
     VisionResult,
     DetectedPerson,
     PPEType,
     PostureRisk,
+    _compute_missing_ppe,
+    _postprocess_boxes,
+    _postprocess_boxes_numpy,
 )
 
 
+@pytest.fixture(scope="module", autouse=True)
+def warm_jit():
+    """Compile le noyau Numba une fois pour le module (coût JIT hors des tests)."""
+    _postprocess_boxes(np.zeros((1, 4), dtype=np.int32), 800.0, 1700.0)
+
+
+@pytest.fixture(scope="module")
+async def connected_sim():
+    """Simulateur Vision connecté, partagé par le module."""
+    simulator = VisionSimulator()
+    await simulator.connect()
+    yield simulator
+    await simulator.disconnect()
+
+
 class TestPPEType:
     """Tests pour les flags PPE."""
     
@@ -30,16 +52,44 @@ class TestPPEType:
         assert required & PPEType.GLOVES
         assert not (required & PPEType.HELMET)
     
-    def test_ppe_missing_calculation(self):
-        """Test calcul EPI manquants."""
+    def test_ppe_missing_batch(self):
+        """Test calcul EPI manquants uint8 sur toutes les combinaisons."""
+        all_ppe = int(np.bitwise_or.reduce([p.value for p in PPEType]))
+        required, detected = np.meshgrid(
+            np.arange(all_ppe + 1, dtype=np.uint8),
+            np.arange(all_ppe + 1, dtype=np.uint8),
+        )
+        required = required.ravel()
+        detected = detected.ravel()
+    
+        missing = _compute_missing_ppe(required, detected)
+    
+        assert missing.dtype == np.uint8
+        # Mêmes résultats que les flags PPEType
+        expected = [
+            (PPEType(int(r)) & ~PPEType(int(d))).value
+            for r, d in zip(required, detected)
+        ]
+        np.testing.assert_array_equal(missing, expected)
+        # Sous-ensemble des requis, disjoint des détectés
+        np.testing.assert_array_equal(missing & ~required, 0)
+        np.testing.assert_array_equal(missing & detected, 0)
+        np.testing.assert_array_equal(missing | (required & detected), required)
+    
+    def test_ppe_missing_scalar_required(self):
+        """Test EPI requis communs à toutes les personnes (diffusion)."""
         required = PPEType.SAFETY_GLASSES | PPEType.GLOVES | PPEType.HELMET
-        detected = PPEType.SAFETY_GLASSES | PPEType.GLOVES
+        detected = np.array([
+            PPEType.NONE,
+            PPEType.SAFETY_GLASSES | PPEType.GLOVES,
+            required | PPEType.HIGH_VIS_VEST,
+        ], dtype=np.uint8)
         
-        missing = required & ~detected
+        missing = _compute_missing_ppe(np.uint8(required), detected)
         
-        assert missing == PPEType.HELMET
-        assert not (missing & PPEType.SAFETY_GLASSES)
-        assert not (missing & PPEType.GLOVES)
+        assert [PPEType(int(m)) for m in missing] == [
+            required, PPEType.HELMET, PPEType.NONE,
+        ]
 
 
 class TestPostureRisk:
@@ -113,6 +163,22 @@ class TestVisionResult:
         assert result.all_ppe_ok is True
         assert result.intrusion_detected is False
     
+    def test_reset_in_place(self):
+        """Test remise à vide sur place (pool du driver)."""
+        result = VisionResult(
+            persons_detected=1,
+            min_distance_mm=600.0,
+            intrusion_detected=True,
+            missing_ppe_types=PPEType.GLOVES,
+            distances_mm=np.array([600.0]),
+        )
+        persons = result.persons
+        
+        assert result.reset() is result
+        assert result.persons is persons
+        assert result.to_dict() == VisionResult().to_dict()
+        assert result.distances_mm is None
+    
     def test_result_with_persons(self):
         """Test résultat avec personnes."""
         persons = [
@@ -179,127 +245,251 @@ class TestVisionResult:
 class TestVisionSimulator:
     """Tests pour le simulateur Vision."""
     
-    @pytest.fixture
-    def simulator(self):
-        return VisionSimulator()
-    
-    @pytest.mark.asyncio
-    async def test_connect(self, simulator):
-        """Test connexion."""
-        result = await simulator.connect()
-        assert result is True
-        assert simulator.is_connected is True
-    
-    @pytest.mark.asyncio
-    async def test_disconnect(self, simulator):
+    async def test_disconnect(self):
         """Test déconnexion."""
+        simulator = VisionSimulator()
         await simulator.connect()
         await simulator.disconnect()
         assert simulator.is_connected is False
     
-    @pytest.mark.asyncio
-    async def test_callbacks(self, simulator):
+    async def test_callbacks(self, connected_sim):
         """Test callbacks."""
         results_received = []
-        
-        simulator.on_result(lambda r: results_received.append(r))
-        
-        await simulator.connect()
-        await simulator.start_processing(50)
-        
-        import asyncio
-        await asyncio.sleep(0.2)
-        
-        await simulator.stop_processing()
-        await simulator.disconnect()
+        enough = asyncio.Event()
+        
+        def on_result(r):
+            results_received.append(r)
+            if len(results_received) >= 2:
+                enough.set()
+        
+        connected_sim.on_result(on_result)
+        try:
+            await connected_sim.start_processing(50)
+            await asyncio.wait_for(enough.wait(), timeout=2.0)
+        finally:
+            await connected_sim.stop_processing()
+            # Simulateur partagé: ne pas laisser le callback aux tests suivants
+            connected_sim._callbacks_result.remove(on_result)
         
         assert len(results_received) >= 2
-        assert all(isinstance(r, VisionResult) for r in results_received)
+        assert {type(r) for r in results_received} == {VisionResult}
     
-    @pytest.mark.asyncio
-    async def test_intrusion_callback(self, simulator):
-        """Test callback intrusion."""
+    async def test_intrusion_callback(self):
+        """Test callback intrusion (scénario déterministe)."""
+        # Graine dont le premier tirage (>= 0.95) donne une intrusion
+        simulator = VisionSimulator(VisionConfig(rng_seed=2))
         intrusions = []
+        done = asyncio.Event()
+        
+        def on_intrusion(p):
+            intrusions.append(p)
+            done.set()
         
-        simulator.on_intrusion(lambda p: intrusions.append(p))
+        simulator.on_intrusion(on_intrusion)
         
         await simulator.connect()
         await simulator.start_processing(20)
-        
-        import asyncio
-        await asyncio.sleep(1.0)  # Attendre assez pour avoir une intrusion (5% chance)
-        
-        await simulator.stop_processing()
+        await asyncio.wait_for(done.wait(), timeout=1.0)
         await simulator.disconnect()
         
-        # Il peut y avoir ou non des intrusions (aléatoire)
-        for intrusion in intrusions:
-            assert isinstance(intrusion, DetectedPerson)
-            assert intrusion.in_danger_zone is True
+        assert len(intrusions) == 1
+        assert isinstance(intrusions[0], DetectedPerson)
+        assert intrusions[0].in_danger_zone is True
+
+
+_RTSP_CONFIG = {
+    "camera_source": "rtsp://192.168.1.100/stream",
+    "camera_type": "rtsp",
+    "width": 1280,
+    "height": 720,
+    "confidence_threshold": 0.7,
+}
 
 
 class TestVisionConfig:
     """Tests pour VisionConfig."""
     
-    def test_default_config(self):
-        """Test configuration par défaut."""
-        config = VisionConfig()
-        
-        assert config.camera_source == "0"
-        assert config.width == 1920
-        assert config.height == 1080
-        assert config.fps == 30
-        assert config.confidence_threshold == 0.5
-    
-    def test_custom_config(self):
-        """Test configuration personnalisée."""
-        config = VisionConfig(
-            camera_source="rtsp://192.168.1.100/stream",
-            camera_type="rtsp",
-            width=1280,
-            height=720,
-            confidence_threshold=0.7,
-        )
-        
-        assert config.camera_source == "rtsp://192.168.1.100/stream"
-        assert config.camera_type == "rtsp"
-        assert config.width == 1280
+    @pytest.mark.parametrize(
+        "kwargs,expected",
+        [
+            ({}, {
+                "camera_source": "0",
+                "width": 1920,
+                "height": 1080,
+                "fps": 30,
+                "confidence_threshold": 0.5,
+            }),
+            # Champs non fournis: valeurs par défaut conservées
+            (_RTSP_CONFIG, {**_RTSP_CONFIG, "fps": 30}),
+        ],
+        ids=["default", "custom"],
+    )
+    def test_config(self, kwargs, expected):
+        """Test configuration par défaut et personnalisée."""
+        config = VisionConfig(**kwargs)
+        
+        assert {k: getattr(config, k) for k in expected} == expected
 
 
 class TestDistanceEstimation:
     """Tests pour l'estimation de distance."""
     
     def test_distance_formula(self):
-        """Test formule de distance."""
+        """Test formule de distance sur une plage de hauteurs."""
         # distance = (hauteur_réelle × focale) / hauteur_pixels
         known_height_mm = 1700.0
         focal_length_px = 800.0
         
         # Personne proche (grande dans l'image)
-        height_px_close = 400
-        distance_close = (known_height_mm * focal_length_px) / height_px_close
-        assert distance_close == 3400.0  # mm
-        
-        # Personne loin (petite dans l'image)
-        height_px_far = 100
-        distance_far = (known_height_mm * focal_length_px) / height_px_far
-        assert distance_far == 13600.0  # mm
+        assert (known_height_mm * focal_length_px) / 400 == 3400.0  # mm
+        
+        height_px = np.arange(50, 800)
+        xyxy = np.zeros((len(height_px), 4), dtype=np.int32)
+        xyxy[:, 2] = 10
+        xyxy[:, 3] = height_px
+        
+        distances, _ = _postprocess_boxes(xyxy, focal_length_px, known_height_mm)
+        
+        np.testing.assert_allclose(
+            distances, known_height_mm * focal_length_px / height_px
+        )
+        # Décroissante: plus la personne est grande, plus elle est proche
+        assert np.all(np.diff(distances) < 0)
+        # Aller-retour: la hauteur se retrouve depuis la distance
+        np.testing.assert_allclose(
+            known_height_mm * focal_length_px / distances, height_px
+        )
     
     def test_calibration_formula(self):
         """Test formule de calibration."""
         # focale = (hauteur_px × distance) / hauteur_réelle
-        known_distance_mm = 2000.0
-        measured_height_px = 300
         known_height_mm = 1700.0
         
-        focal_length = (measured_height_px * known_distance_mm) / known_height_mm
+        focal_length = (300 * 2000.0) / known_height_mm
         assert round(focal_length, 1) == 352.9
+        
+        # Inverse de la formule de distance sur une grille hauteur × distance
+        height_px, distance_mm = np.meshgrid(
+            np.arange(50, 800, 10), np.linspace(500.0, 15000.0, 30)
+        )
+        focal_length = height_px * distance_mm / known_height_mm
+        
+        np.testing.assert_allclose(
+            known_height_mm * focal_length / height_px, distance_mm
+        )
+    
+    def test_downsample_keeps_native_focal(self):
+        """Test calibration sur frame réduite: focale en pixels natifs."""
+        driver = VisionAIDriver(VisionConfig(preproc_width=960, preproc_height=540))
+        frame = driver._downsample(np.zeros((1080, 1920, 3), dtype=np.uint8))
+        
+        assert frame.shape == (540, 960, 3)
+        assert driver._frame_scale == 0.5
+        
+        # 150 px sur la frame réduite = 300 px en natif (cf. test ci-dessus)
+        driver.calibrate_distance(2000.0, 150)
+        assert round(driver.config.focal_length_px, 1) == 352.9
+    
+    def test_calibration_before_first_frame(self):
+        """Test calibration avant capture: échelle issue de la résolution configurée."""
+        driver = VisionAIDriver(VisionConfig(
+            width=1920, height=1080, preproc_width=960, preproc_height=540,
+        ))
+        
+        assert driver._frame_scale == 0.5
+        driver.calibrate_distance(2000.0, 150)
+        assert round(driver.config.focal_length_px, 1) == 352.9
+        
+        # Sans sous-échantillonnage: pas de mise à l'échelle
+        native = VisionAIDriver(VisionConfig(preproc_width=0))
+        assert native._frame_scale == 1.0
+
+
+class TestPostprocessBoxes:
+    """Tests pour le post-traitement vectorisé des boxes."""
+    
+    def test_distances_and_posture(self):
+        """Test distance et posture sur plusieurs boxes."""
+        xyxy = np.array([
+            [0, 0, 100, 400],    # Debout, ratio 0.25
+            [0, 0, 240, 400],    # Penché, ratio 0.6
+            [0, 0, 300, 400],    # Accroupi, ratio 0.75
+            [0, 100, 50, 100],   # Hauteur nulle
+        ], dtype=np.int32)
+        
+        distances, risks = _postprocess_boxes(xyxy, 800.0, 1700.0)
+        
+        assert distances[:3].tolist() == [3400.0, 3400.0, 3400.0]
+        assert distances[3] == float('inf')
+        assert risks.tolist() == [
+            PostureRisk.LOW,
+            PostureRisk.MEDIUM,
+            PostureRisk.HIGH,
+            PostureRisk.LOW,
+        ]
+    
+    def test_matches_numpy_fallback(self):
+        """Test version compilée identique à la version NumPy."""
+        xyxy = np.random.default_rng(0).integers(0, 1000, (50, 4)).astype(np.int32)
+        
+        distances, risks = _postprocess_boxes(xyxy, 800.0, 1700.0)
+        expected_distances, expected_risks = _postprocess_boxes_numpy(xyxy, 800.0, 1700.0)
+        
+        np.testing.assert_allclose(distances, expected_distances)
+        np.testing.assert_array_equal(risks, expected_risks)
+        assert risks.dtype == np.uint8
+
+
+class TestNotifyCallbacks:
+    """Tests pour la notification des callbacks du driver."""
+    
+    async def test_failing_callback_does_not_block_others(self):
+        """Un callback en erreur n'empêche pas les autres d'être appelés."""
+        driver = VisionAIDriver()
+        received = []
+        
+        async def async_cb(result):
+            received.append(("async", result))
+        
+        def failing_cb(result):
+            raise RuntimeError("boom")
+        
+        driver.on_result(failing_cb)
+        driver.on_result(async_cb)
+        driver.on_result(lambda r: received.append(("sync", r)))
+        
+        result = VisionResult()
+        await driver._notify_callbacks(result)
+        
+        assert sorted(kind for kind, _ in received) == ["async", "sync"]
+        assert all(r is result for _, r in received)
+    
+    async def test_sync_inline_and_offloaded_snapshot(self):
+        """Synchrone: sur la boucle avec l'objet du pool; offload: copie hors boucle."""
+        driver = VisionAIDriver()
+        calls = {}
+        
+        driver.on_result(lambda r: calls.setdefault("inline", (threading.get_ident(), r)))
+        driver.on_result(
+            lambda r: calls.setdefault("offload", (threading.get_ident(), r)),
+            offload=True,
+        )
+        
+        result = VisionResult(persons_detected=1, min_distance_mm=600.0)
+        await driver._notify_callbacks(result)
+        
+        inline_thread, inline_result = calls["inline"]
+        offload_thread, offload_result = calls["offload"]
+        assert inline_thread == threading.get_ident()
+        assert inline_result is result
+        assert offload_thread != threading.get_ident()
+        assert offload_result is not result
+        assert offload_result.to_dict() == result.to_dict()
 
 
 class TestIntegration:
     """Tests d'intégration basiques."""
     
-    @pytest.mark.asyncio
     async def test_full_simulation_cycle(self):
         """Test cycle complet de simulation."""
         config = VisionConfig(
@@ -310,13 +500,19 @@ class TestIntegration:
         simulator = VisionSimulator(config)
         
         results = []
-        simulator.on_result(lambda r: results.append(r))
+        enough = asyncio.Event()
+        
+        def on_result(r):
+            results.append(r)
+            if len(results) >= 10:
+                enough.set()
+        
+        simulator.on_result(on_result)
         
         assert await simulator.connect()
         await simulator.start_processing(30)
         
-        import asyncio
-        await asyncio.sleep(0.5)
+        await asyncio.wait_for(enough.wait(), timeout=5.0)
         
         await simulator.stop_processing()
         await simulator.disconnect()